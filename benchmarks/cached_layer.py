@@ -0,0 +1,69 @@
+'''
+Draws a tile map background under a slowly panning view, blitting every visible tile each frame and through a `CachedLayer`,
+and reports the render time of each along with how often the layer was redrawn.
+
+Run from the repository root with `python -m benchmarks.cached_layer`.
+'''
+
+import numpy as np
+import pygame
+
+from boxlet import CachedLayer, Entity, manager
+
+
+TILE = 16
+MAP_SIZE = (200, 200)
+FRAMES = 240
+PAN_SPEED = 30 # pixels per second
+
+
+def draw_tiles(surface:pygame.Surface, origin):
+	'''Blits every tile overlapping the surface, with the world position `origin` at its top left.'''
+	w, h = surface.get_size()
+	x0, y0 = int(origin[0] // TILE), int(origin[1] // TILE)
+	x1, y1 = int((origin[0] + w) // TILE) + 1, int((origin[1] + h) // TILE) + 1
+	surface.blits([(tiles[tile_map[x % MAP_SIZE[0], y % MAP_SIZE[1]]], (x * TILE - origin[0], y * TILE - origin[1])) for x in range(x0, x1) for y in range(y0, y1)], False)
+
+
+class Pan(Entity):
+	def vary_update(self):
+		manager.screen_pos[0] += PAN_SPEED * manager.delta_time
+
+
+class Tiles(Entity):
+	@Entity.priority(float('-inf'))
+	def render(self):
+		draw_tiles(manager.canvas, np.floor(manager.screen_pos))
+
+
+class CachedTiles(CachedLayer):
+	def draw(self, surface, origin):
+		draw_tiles(surface, origin)
+
+
+def measure(layer:Entity):
+	manager.screen_pos[:] = 0
+	timings = manager.run(frames = FRAMES, realtime = False)
+	layer.destroy()
+	return np.median(timings['render'])
+
+
+if __name__ == '__main__':
+	manager.init(render_mode = 'headless', canvas_size = (640, 360))
+	Pan()
+
+	rng = np.random.default_rng(1)
+	tiles = []
+	for i in range(8):
+		tile = pygame.Surface((TILE, TILE)).convert()
+		tile.fill(rng.integers(0, 255, 3).tolist())
+		tiles.append(tile)
+	tile_map = rng.integers(0, len(tiles), MAP_SIZE)
+
+	every_frame = measure(Tiles())
+	cached_layer = CachedTiles()
+	cached = measure(cached_layer)
+
+	print(f'{640 // TILE * 360 // TILE} visible tiles, panning {PAN_SPEED}px/s for {FRAMES} frames')
+	print(f'tiles every frame: {every_frame * 1000:6.3f}ms median render')
+	print(f'cached layer:      {cached * 1000:6.3f}ms median render ({every_frame / cached:.1f}x), redrawn {cached_layer.redraws} times')
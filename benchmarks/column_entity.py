@@ -0,0 +1,63 @@
+'''
+Compares 100k movers updated one entity at a time with the same movers stored in a `ColumnEntity` and updated by one `Entity.batched` call.
+
+Run from the repository root with `python -m benchmarks.column_entity`.
+'''
+
+import time
+
+from boxlet import ColumnEntity, Entity, np
+
+
+ENTITY_COUNT = 100_000
+FRAMES = 20
+DELTA = 1 / 60
+
+
+class Mover(Entity):
+	def __init__(self, position, velocity) -> None:
+		self.position = np.array(position, float)
+		self.velocity = np.array(velocity, float)
+
+	def fixed_update(self):
+		self.position += self.velocity * DELTA
+
+
+class ColumnMover(ColumnEntity):
+	fields = {'position': (float, 2), 'velocity': (float, 2)}
+
+	def __init__(self, position, velocity) -> None:
+		self.position = position
+		self.velocity = velocity
+
+	@Entity.batched
+	def fixed_update(columns):
+		columns.position += columns.velocity * DELTA
+
+
+def measure(cls):
+	start = time.perf_counter()
+	for i in range(ENTITY_COUNT):
+		cls((i, 0), (1, 2))
+	Entity.__add_new_entities__()
+	created = time.perf_counter() - start
+
+	plan = Entity.__build_dispatch_plan__('fixed_update')
+	start = time.perf_counter()
+	for _ in range(FRAMES):
+		for f, entities in plan:
+			for e in entities:
+				f(e)
+	updated = (time.perf_counter() - start) / FRAMES
+
+	for e in Entity.entity_dict[cls]:
+		e.destroy()
+	Entity.__destroy_entities__()
+	return created, updated
+
+
+if __name__ == '__main__':
+	print(f'{ENTITY_COUNT} movers, {FRAMES} frames')
+	for cls in (Mover, ColumnMover):
+		created, updated = measure(cls)
+		print(f'{cls.__name__:12} create: {created * 1000:8.1f}ms  fixed_update: {updated * 1000:8.2f}ms/frame')
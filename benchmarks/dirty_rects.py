@@ -0,0 +1,64 @@
+'''
+Renders a mostly static scene where a few sprites move, with the whole canvas redrawn every frame and with dirty rects,
+and reports the time spent rendering and presenting.
+
+Uses the SDL dummy video driver so no window is opened.
+Each mode runs in its own process, run from the repository root with `python -m benchmarks.dirty_rects`.
+'''
+
+import os
+import random
+import subprocess
+import sys
+
+os.environ['SDL_VIDEODRIVER'] = 'dummy'
+
+import numpy as np
+import pygame
+
+from boxlet import Entity, manager
+
+
+SPRITES = 200
+MOVING = 3
+FRAMES = 200
+
+
+class Box(Entity):
+	sprite:pygame.Surface
+
+	def __init__(self, x:int, y:int, moving:bool) -> None:
+		self.x = x
+		self.y = y
+		self.moving = moving
+
+	def fixed_update(self):
+		if self.moving:
+			manager.damage((self.x, self.y, 10, 10))
+			self.x = (self.x + 1) % 630
+			manager.damage((self.x, self.y, 10, 10))
+
+	def render(self):
+		manager.canvas.blit(self.sprite, (self.x, self.y))
+
+
+def measure(dirty:bool):
+	manager.init(canvas_size = (640, 360), display_size = (1920, 1080), dirty_rects = dirty)
+	Box.sprite = pygame.Surface((10, 10), pygame.SRCALPHA)
+	Box.sprite.fill((255, 0, 0, 128))
+
+	random.seed(1)
+	for i in range(SPRITES):
+		Box(random.randrange(630), random.randrange(350), i < MOVING)
+
+	timings = manager.run(frames = FRAMES, fixed_dt = 1 / 60, realtime = False)
+	print(f'{"dirty rects" if dirty else "full redraw":>11}: {np.mean(timings["render"]) * 1000:6.3f}ms mean render')
+
+
+if __name__ == '__main__':
+	if len(sys.argv) > 1:
+		measure(sys.argv[1] == 'dirty')
+	else:
+		print(f'{SPRITES} sprites with {MOVING} moving, 640x360 canvas scaled to 1920x1080, {FRAMES} frames')
+		for mode in ('full', 'dirty'):
+			subprocess.run([sys.executable, '-m', 'benchmarks.dirty_rects', mode])
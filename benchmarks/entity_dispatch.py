@@ -0,0 +1,58 @@
+'''
+Compares the cached dispatch plans of `Entity.__call_function__` with the previous per-call walk of `Entity.entity_callables`.
+
+Run from the repository root with `python -m benchmarks.entity_dispatch`.
+'''
+
+import time
+
+from boxlet import Entity
+
+
+TYPE_COUNT = 60
+ENTITY_COUNT = 40_000
+FRAMES = 30
+
+
+def legacy_call_function(name:str, *param):
+	'The loop used before dispatch plans, looking up every registered type on every call.'
+	for t, f in Entity.entity_callables[name]:
+		for e in Entity.entity_dict[t]:
+			f(e, *param)
+
+
+def create_world():
+	types = []
+	for i in range(TYPE_COUNT):
+		def fixed_update(self):
+			self.value += 1
+
+		fixed_update = Entity.priority(i % 7)(fixed_update)
+		types.append(type(f'BenchEntity{i}', (Entity,), {'fixed_update': fixed_update}))
+
+	# only half of the types have entities, the rest stay registered but empty
+	for i in range(ENTITY_COUNT):
+		e = types[(i % (TYPE_COUNT // 2)) * 2]()
+		e.value = 0
+
+	Entity.__add_new_entities__()
+
+
+def measure(call):
+	call('fixed_update') # warm up
+	start = time.perf_counter()
+	for _ in range(FRAMES):
+		call('fixed_update')
+	elapsed = time.perf_counter() - start
+	return FRAMES * ENTITY_COUNT / elapsed
+
+
+if __name__ == '__main__':
+	create_world()
+
+	before = measure(legacy_call_function)
+	after = measure(Entity.__call_function__)
+
+	print(f'{ENTITY_COUNT} entities over {TYPE_COUNT} types, {FRAMES} frames')
+	print(f'before: {before:,.0f} calls/s')
+	print(f'after:  {after:,.0f} calls/s ({after / before:.2f}x)')
@@ -0,0 +1,52 @@
+'''
+Measures the memory used by 1M lightweight entities, with and without `__slots__`.
+
+Run from the repository root with `python -m benchmarks.entity_memory`.
+'''
+
+import gc
+import tracemalloc
+
+from boxlet import Entity
+
+
+ENTITY_COUNT = 1_000_000
+
+
+class DictTile(Entity):
+	def __init__(self, x, y, kind) -> None:
+		self.x = x
+		self.y = y
+		self.kind = kind
+
+
+class SlottedTile(Entity):
+	__slots__ = ('x', 'y', 'kind')
+
+	def __init__(self, x, y, kind) -> None:
+		self.x = x
+		self.y = y
+		self.kind = kind
+
+
+def measure(cls):
+	gc.collect()
+	tracemalloc.start()
+	for i in range(ENTITY_COUNT):
+		cls(i, i, 1)
+	Entity.__add_new_entities__()
+	size, _ = tracemalloc.get_traced_memory()
+	tracemalloc.stop()
+
+	for e in Entity.entity_dict[cls]:
+		e.destroy()
+	Entity.__destroy_entities__()
+	return size
+
+
+if __name__ == '__main__':
+	print(f'{ENTITY_COUNT:,} entities')
+	results = {cls: measure(cls) for cls in (DictTile, SlottedTile)}
+	for cls, size in results.items():
+		print(f'{cls.__name__:12} {size / 2**20:8.1f}MB  {size / ENTITY_COUNT:6.1f} bytes/entity')
+	print(f'saved: {(results[DictTile] - results[SlottedTile]) / 2**20:.1f}MB')
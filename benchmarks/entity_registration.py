@@ -0,0 +1,74 @@
+'''
+Times the creation of a few hundred generated `Entity` subclasses, against the same classes registered by the previous
+`__init_subclass__`, which called `getattr` on everything in `dir(cls)` and re-sorted a list for each function.
+
+Run from the repository root with `python -m benchmarks.entity_registration`.
+'''
+
+import time
+
+from boxlet import Entity, pygame
+
+
+CLASS_COUNT = 600
+DEPTH = 4
+
+
+class LegacyRegistry:
+	'The registration used before, writing into its own dictionaries so it does not touch `Entity`.'
+
+	watched_callables = ['render', 'vary_update', 'fixed_update']
+	entity_callables = {s: [] for s in watched_callables}
+	entity_dict = {}
+
+	def __init_subclass__(cls):
+
+		def append_sort(c, f, name):
+			LegacyRegistry.entity_callables[name].append((c, f))
+			LegacyRegistry.entity_callables[name].sort(key = lambda ef: ef[1]._priority if hasattr(ef[1], '_priority') else 0)
+
+		for func in LegacyRegistry.watched_callables:
+			if hasattr(cls, func):
+				append_sort(cls, getattr(cls, func), func)
+
+		for attr in dir(cls):
+			func = getattr(cls, attr)
+			if callable(func) and hasattr(func, '_watched_events'):
+				for w in func._watched_events:
+					LegacyRegistry.entity_callables.setdefault(f'event_{w}', [])
+					append_sort(cls, func, f'event_{w}')
+
+		LegacyRegistry.entity_dict[cls] = []
+
+
+def class_body(i:int):
+	'Creates a body that overrides some of the watched functions, depending on the index.'
+	body = {f'helper_{j}': (lambda self: None) for j in range(10)}
+
+	if i % 2 == 0:
+		body['fixed_update'] = Entity.priority(i % 5)(lambda self: None)
+	if i % 3 == 0:
+		body['render'] = lambda self: None
+	if i % 4 == 0:
+		body[f'on_key_{i}'] = Entity.watch_event(pygame.KEYDOWN)(lambda self, event: None)
+
+	return body
+
+
+def generate(base:type):
+	'Creates `CLASS_COUNT` classes, each inheriting from one of the previous classes up to `DEPTH` levels deep.'
+	classes = [base]
+	start = time.perf_counter()
+	for i in range(CLASS_COUNT):
+		parent = classes[i // DEPTH] if i >= DEPTH else base
+		classes.append(type(f'{base.__name__}Generated{i}', (parent,), class_body(i)))
+	return time.perf_counter() - start
+
+
+if __name__ == '__main__':
+	before = generate(LegacyRegistry)
+	after = generate(Entity)
+
+	print(f'{CLASS_COUNT} generated subclasses')
+	print(f'before: {before * 1000:7.1f}ms')
+	print(f'after:  {after * 1000:7.1f}ms ({before / after:.1f}x)')
@@ -0,0 +1,94 @@
+'''
+Churns short lived entities, spawning a wave every frame and destroying the previous one, and reports spawn throughput
+along with how many entity objects had to be freshly allocated.
+
+Run from the repository root with `python -m benchmarks.entity_spawning`.
+'''
+
+import time
+
+from boxlet import ColumnEntity, Entity
+
+
+WAVE_SIZE = 5_000
+FRAMES = 40
+
+
+class Bullet(Entity):
+	def __init__(self, x = 0.0, y = 0.0) -> None:
+		self.x = x
+		self.y = y
+
+
+class PooledBullet(Bullet):
+	pool_size = WAVE_SIZE
+
+
+class ColumnBullet(ColumnEntity):
+	fields = {'position': (float, 2)}
+
+
+class PooledColumnBullet(ColumnBullet):
+	pool_size = WAVE_SIZE
+
+
+def spawn_each(cls):
+	return [cls(1.0, 2.0) for _ in range(WAVE_SIZE)]
+
+
+def spawn_each_column(cls):
+	entities = [cls() for _ in range(WAVE_SIZE)]
+	for e in entities:
+		e.position = (1.0, 2.0)
+	return entities
+
+
+def spawn_many(cls):
+	return cls.spawn_many(WAVE_SIZE, x = 1.0, y = 2.0)
+
+
+def spawn_many_column(cls):
+	return cls.spawn_many(WAVE_SIZE, position = (1.0, 2.0))
+
+
+def measure(cls, spawn):
+	Entity.pools[cls].clear()
+	fresh = 0
+	spawning = 0.0
+
+	for _ in range(FRAMES):
+		for e in Entity.entity_dict[cls]:
+			e.destroy()
+		Entity.__destroy_entities__()
+
+		start = time.perf_counter()
+		entities = spawn(cls)
+		Entity.__add_new_entities__()
+		spawning += time.perf_counter() - start
+
+		# objects from a previous wave were already marked
+		for e in entities:
+			if '_benchmark_seen' not in e.__dict__:
+				e._benchmark_seen = True
+				fresh += 1
+
+	for e in Entity.entity_dict[cls]:
+		e.destroy()
+	Entity.__destroy_entities__()
+	return WAVE_SIZE * FRAMES / spawning, fresh
+
+
+if __name__ == '__main__':
+	print(f'{FRAMES} waves of {WAVE_SIZE} entities')
+	for cls, spawn in [
+			(Bullet, spawn_each), 
+			(PooledBullet, spawn_each), 
+			(Bullet, spawn_many), 
+			(PooledBullet, spawn_many),
+			(ColumnBullet, spawn_each_column), 
+			(PooledColumnBullet, spawn_each_column), 
+			(ColumnBullet, spawn_many_column), 
+			(PooledColumnBullet, spawn_many_column),
+			]:
+		throughput, fresh = measure(cls, spawn)
+		print(f'{cls.__name__:19} {spawn.__name__:18} {throughput:12,.0f} spawns/s {fresh:9,} allocated')
@@ -0,0 +1,61 @@
+'''
+Floods the queue with mouse motion every frame, like a high polling rate mouse, and compares the time spent delivering it
+to a handler called for every event and to a coalesced handler that receives the summed movement.
+
+Each mode runs in its own process, run from the repository root with `python -m benchmarks.event_coalescing`.
+'''
+
+import subprocess
+import sys
+
+import numpy as np
+import pygame
+
+from boxlet import Entity, manager
+
+
+EVENTS_PER_FRAME = 1_000
+FRAMES = 100
+
+
+class Look(Entity):
+	def __init__(self) -> None:
+		self.x_rot = 0.0
+		self.y_rot = 0.0
+
+
+class EachEventLook(Look):
+	@Entity.watch_event(pygame.MOUSEMOTION)
+	def mouse_movement(self, event):
+		self.x_rot += event.rel[0] * -0.5
+		self.y_rot += event.rel[1] * -0.5
+
+
+class CoalescedLook(Look):
+	@Entity.watch_coalesced_event(pygame.MOUSEMOTION, total = 'rel')
+	def mouse_movement(self, rel):
+		self.x_rot += rel[0] * -0.5
+		self.y_rot += rel[1] * -0.5
+
+
+class Mouse(Entity):
+	def vary_update(self):
+		for _ in range(EVENTS_PER_FRAME):
+			pygame.event.post(pygame.event.Event(pygame.MOUSEMOTION, rel = (1, 1), pos = (0, 0), buttons = (0, 0, 0)))
+
+
+def measure(mode:str):
+	manager.init(render_mode = 'headless')
+	look = {'each': EachEventLook, 'coalesced': CoalescedLook}[mode]()
+	Mouse()
+	timings = manager.run(frames = FRAMES, realtime = False)
+	print(f'{mode:>9}: {np.median(timings["events"]) * 1000:6.3f}ms median event phase, rotation {look.x_rot:.0f}')
+
+
+if __name__ == '__main__':
+	if len(sys.argv) > 1:
+		measure(sys.argv[1])
+	else:
+		print(f'{EVENTS_PER_FRAME} mouse motion events per frame, {FRAMES} frames')
+		for mode in ('each', 'coalesced'):
+			subprocess.run([sys.executable, '-m', 'benchmarks.event_coalescing', mode])
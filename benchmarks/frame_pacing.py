@@ -0,0 +1,39 @@
+'''
+Compares the CPU time spent waiting for frames by `pygame.time.Clock.tick_busy_loop` and by `FramePacer`,
+along with how closely each keeps to the target frame rate.
+
+Run from the repository root with `python -m benchmarks.frame_pacing`.
+'''
+
+import time
+
+import pygame
+
+from boxlet.frame_pacer import FramePacer
+
+
+FPS = 120
+FRAMES = 360
+
+
+def measure(wait):
+	wait()
+	cpu = time.process_time()
+	wall = time.perf_counter()
+	for _ in range(FRAMES):
+		wait()
+	cpu = time.process_time() - cpu
+	wall = time.perf_counter() - wall
+	return FRAMES / wall, cpu / wall
+
+
+if __name__ == '__main__':
+	clock = pygame.time.Clock()
+	pacer = FramePacer()
+
+	busy_fps, busy_cpu = measure(lambda: clock.tick_busy_loop(FPS))
+	paced_fps, paced_cpu = measure(lambda: pacer.wait(FPS))
+
+	print(f'target {FPS} fps, {FRAMES} frames')
+	print(f'tick_busy_loop: {busy_fps:6.1f} fps, {busy_cpu:6.1%} of a core')
+	print(f'FramePacer:     {paced_fps:6.1f} fps, {paced_cpu:6.1%} of a core, {pacer.missed} missed deadlines')
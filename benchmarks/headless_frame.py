@@ -0,0 +1,44 @@
+'''
+Runs the full update loop without a display, with a fixed time step and no waiting between frames,
+and reports the median and worst time of each phase of the frame.
+
+Run from the repository root with `python -m benchmarks.headless_frame`.
+'''
+
+import numpy as np
+
+from boxlet import Entity, manager
+
+
+ENTITY_COUNT = 20_000
+FRAMES = 300
+
+
+class Walker(Entity):
+	def __init__(self) -> None:
+		self.position = np.zeros(2)
+		self.velocity = np.ones(2)
+
+	def fixed_update(self):
+		self.position += self.velocity * manager.fixed_delta_time
+
+
+class Spinner(Entity):
+	def __init__(self) -> None:
+		self.angle = 0.0
+
+	def vary_update(self):
+		self.angle += manager.delta_time
+
+
+if __name__ == '__main__':
+	manager.init(render_mode = 'headless', target_frames_per_second = 120)
+
+	for i in range(ENTITY_COUNT):
+		(Walker if i % 2 else Spinner)()
+
+	timings = manager.run(frames = FRAMES, fixed_dt = 1 / 60, realtime = False)
+
+	print(f'{ENTITY_COUNT} entities, {FRAMES} frames')
+	for phase, t in timings.items():
+		print(f'{phase:>16}: median {np.median(t) * 1000:7.3f}ms  max {t.max() * 1000:7.3f}ms')
@@ -0,0 +1,63 @@
+'''
+Interpolates many small `VaryFloats`, like the position of every entity,
+comparing a call to `interpolate` for each with one pass over the registered arena.
+
+Run from the repository root with `python -m benchmarks.interpolation_arena`.
+'''
+
+import time
+
+import numpy as np
+
+from boxlet import InterpolationArena, VaryFloats
+
+
+ENTITIES = 5_000
+FRAMES = 200
+
+
+def per_instance(floats:list[VaryFloats]):
+	start = time.perf_counter()
+	for frame in range(FRAMES):
+		t = frame / FRAMES
+		for f in floats:
+			f.interpolate(t)
+	return time.perf_counter() - start
+
+
+def per_instance_out(floats:list[VaryFloats]):
+	outs = [np.empty_like(f.current) for f in floats]
+	start = time.perf_counter()
+	for frame in range(FRAMES):
+		t = frame / FRAMES
+		for f, out in zip(floats, outs):
+			f.interpolate(t, out)
+	return time.perf_counter() - start
+
+
+def arena(floats:list[VaryFloats]):
+	for f in floats:
+		f.register()
+	start = time.perf_counter()
+	for frame in range(FRAMES):
+		InterpolationArena.interpolate_all(frame / FRAMES)
+	elapsed = time.perf_counter() - start
+	for f in floats:
+		f.unregister()
+	return elapsed
+
+
+if __name__ == '__main__':
+	rng = np.random.default_rng(1)
+	floats = [VaryFloats(rng.random(2)) for _ in range(ENTITIES)]
+	for f in floats:
+		f.set(rng.random(2))
+
+	plain = per_instance(floats)
+	out = per_instance_out(floats)
+	fused = arena(floats)
+
+	print(f'{ENTITIES} VaryFloats of 2 values, {FRAMES} frames')
+	print(f'interpolate(t):        {plain / FRAMES * 1e3:8.3f}ms per frame')
+	print(f'interpolate(t, out):   {out / FRAMES * 1e3:8.3f}ms per frame ({plain / out:.1f}x)')
+	print(f'registered arena:      {fused / FRAMES * 1e3:8.3f}ms per frame ({plain / fused:.0f}x)')
@@ -0,0 +1,75 @@
+'''
+Interpolates the rotations of many objects, comparing a Python slerp for each object
+with registered `QuaternionVaryFloats` and `MatrixVaryFloats` interpolated by the manager's single pass over their arenas.
+
+Run from the repository root with `python -m benchmarks.rotation_interpolation`.
+'''
+
+import math
+import time
+
+import numpy as np
+
+from boxlet import InterpolationArena, MatrixVaryFloats, QuaternionVaryFloats
+from boxlet.rotation_vary_floats import compose_matrices, normalize_rows
+
+
+OBJECTS = 5_000
+FRAMES = 50
+
+
+def slerp(a, b, t):
+	d = sum(x * y for x, y in zip(a, b))
+	if d < 0:
+		b = [-x for x in b]
+		d = -d
+	if d > 0.9995:
+		r = [x + (y - x) * t for x, y in zip(a, b)]
+	else:
+		theta = math.acos(d)
+		s = math.sin(theta)
+		wa = math.sin((1 - t) * theta) / s
+		wb = math.sin(t * theta) / s
+		r = [x * wa + y * wb for x, y in zip(a, b)]
+	m = math.sqrt(sum(x * x for x in r))
+	return [x / m for x in r]
+
+
+def per_object(previous:np.ndarray, current:np.ndarray):
+	pairs = list(zip(previous.tolist(), current.tolist()))
+	start = time.perf_counter()
+	for frame in range(FRAMES):
+		t = frame / FRAMES
+		for a, b in pairs:
+			slerp(a, b, t)
+	return time.perf_counter() - start
+
+
+def arena(floats):
+	floats.register()
+	start = time.perf_counter()
+	for frame in range(FRAMES):
+		InterpolationArena.interpolate_all(frame / FRAMES)
+	elapsed = time.perf_counter() - start
+	floats.unregister()
+	return elapsed
+
+
+if __name__ == '__main__':
+	rng = np.random.default_rng(1)
+	previous = normalize_rows(rng.normal(size = (OBJECTS, 4)))
+	current = normalize_rows(rng.normal(size = (OBJECTS, 4)))
+
+	quaternions = QuaternionVaryFloats(previous)
+	quaternions.set(current)
+	matrices = MatrixVaryFloats(compose_matrices(rng.normal(size = (OBJECTS, 3)), previous, np.ones((OBJECTS, 3))))
+	matrices.set(compose_matrices(rng.normal(size = (OBJECTS, 3)), current, np.ones((OBJECTS, 3))))
+
+	python = per_object(previous, current)
+	fused = arena(quaternions)
+	fused_matrices = arena(matrices)
+
+	print(f'{OBJECTS} rotations, {FRAMES} frames')
+	print(f'python slerp per object:  {python / FRAMES * 1e3:8.3f}ms per frame')
+	print(f'quaternion arena slerp:   {fused / FRAMES * 1e3:8.3f}ms per frame ({python / fused:.0f}x)')
+	print(f'matrix arena (TRS slerp): {fused_matrices / FRAMES * 1e3:8.3f}ms per frame ({python / fused_matrices:.1f}x)')
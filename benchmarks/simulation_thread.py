@@ -0,0 +1,52 @@
+'''
+Runs a render bound frame, where rendering mostly waits on the GPU, with fixed updates in the frame and on a `SimulationThread`,
+and reports the frame rate reached by each.
+
+The wait is stood in for by a sleep, which like waiting on a buffer swap or vsync lets go of the GIL.
+Each mode runs in its own process, run from the repository root with `python -m benchmarks.simulation_thread`.
+'''
+
+import subprocess
+import sys
+import time
+
+from boxlet import Entity, manager
+from boxlet.vary_floats import SharedVaryFloats
+
+
+FRAMES = 120
+RENDER_WAIT = 0.012
+STEP_WORK = 60_000
+
+
+class Body(Entity):
+	def __init__(self) -> None:
+		self.x = 0.0
+		self.position = SharedVaryFloats(size = 2)
+
+	def fixed_update(self):
+		for _ in range(STEP_WORK): # pure python simulation work
+			self.x += 1e-6
+		self.position.set((self.x, 0.0))
+
+	def render(self):
+		self.position.interpolate(manager.interpolate_time)
+		time.sleep(RENDER_WAIT)
+
+
+def measure(threaded:bool):
+	manager.init(render_mode = 'headless', target_frames_per_second = 1000, simulation_thread = threaded)
+	Body()
+	start = time.perf_counter()
+	timings = manager.run(frames = FRAMES, fixed_dt = 1 / 60)
+	elapsed = time.perf_counter() - start
+	print(f'{"simulation thread" if threaded else "single thread":>17}: {FRAMES / elapsed:6.1f} fps, {timings["fixed_update"].sum() * 1000 / FRAMES:5.2f}ms of fixed updates per frame on the main thread')
+
+
+if __name__ == '__main__':
+	if len(sys.argv) > 1:
+		measure(sys.argv[1] == 'threaded')
+	else:
+		print(f'{FRAMES} frames, render waiting {RENDER_WAIT * 1000:.0f}ms')
+		for mode in ('single', 'threaded'):
+			subprocess.run([sys.executable, '-m', 'benchmarks.simulation_thread', mode])
@@ -0,0 +1,76 @@
+'''
+Draws many small sprites each frame, a third of them off screen, with a `blit` per entity,
+with `SpriteBatch.add` per entity, and with one `SpriteBatch.add_many` for a `ColumnEntity` type.
+
+Each mode runs in its own process, run from the repository root with `python -m benchmarks.sprite_batch`.
+'''
+
+import subprocess
+import sys
+
+import numpy as np
+import pygame
+
+from boxlet import ColumnEntity, Entity, SpriteBatch, manager
+
+
+SPRITES = 20_000
+FRAMES = 60
+CANVAS_SIZE = (640, 360)
+
+
+class BlitSprite(Entity):
+	def __init__(self, position) -> None:
+		self.position = position
+
+	def render(self):
+		manager.canvas.blit(sprite, self.position - manager.screen_pos)
+
+
+class BatchSprite(Entity):
+	def __init__(self, position) -> None:
+		self.position = position
+
+	def render(self):
+		batch.add(sprite, self.position)
+
+
+class ColumnSprite(ColumnEntity):
+	fields = {'position': (float, 2)}
+
+	@Entity.batched
+	def render(columns):
+		batch.add_many(sprite, columns.position)
+
+
+def positions():
+	rng = np.random.default_rng(1)
+	# a third of the sprites land outside the canvas
+	return rng.uniform((0, 0), (CANVAS_SIZE[0] * 1.5, CANVAS_SIZE[1]), (SPRITES, 2))
+
+
+def measure(mode:str):
+	global sprite, batch
+	manager.init(render_mode = 'headless', canvas_size = CANVAS_SIZE)
+	sprite = pygame.Surface((8, 8)).convert()
+	sprite.fill('white')
+	batch = SpriteBatch()
+
+	if mode == 'column':
+		ColumnSprite.spawn_many(SPRITES, position = positions())
+	else:
+		for p in positions():
+			(BlitSprite if mode == 'blit' else BatchSprite)(p)
+
+	timings = manager.run(frames = FRAMES, realtime = False)
+	render = np.median(timings['render'][1:])
+	print(f'{mode:>7}: {render * 1000:7.2f}ms median render, {SPRITES / render:12,.0f} sprites/s')
+
+
+if __name__ == '__main__':
+	if len(sys.argv) > 1:
+		measure(sys.argv[1])
+	else:
+		print(f'{SPRITES} sprites of 8x8 on a {CANVAS_SIZE[0]}x{CANVAS_SIZE[1]} canvas')
+		for mode in ('blit', 'batch', 'column'):
+			subprocess.run([sys.executable, '-m', 'benchmarks.sprite_batch', mode])
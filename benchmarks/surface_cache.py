@@ -0,0 +1,67 @@
+'''
+Draws rotating, scaled sprites taken from a sprite sheet, transforming them every frame and through `SurfaceCache`,
+and reports the render time of each along with the cache hit rate.
+
+Run from the repository root with `python -m benchmarks.surface_cache`.
+'''
+
+import numpy as np
+import pygame
+
+from boxlet import Entity, manager
+
+
+SPRITES = 2_000
+FRAMES = 120
+
+
+class Spinner(Entity):
+	cached = False
+
+	def __init__(self, sprite:pygame.Surface, position, speed:float) -> None:
+		self.sprite = sprite
+		self.position = position
+		self.speed = speed
+		self.angle = 0.0
+
+	def vary_update(self):
+		self.angle += self.speed * manager.delta_time
+
+	def render(self):
+		if Spinner.cached:
+			image = manager.surface_cache.get(self.sprite, 3, self.angle)
+		else:
+			image = pygame.transform.rotate(pygame.transform.scale_by(self.sprite, 3), self.angle)
+		manager.canvas.blit(image, self.position)
+
+
+def measure(cached:bool):
+	Spinner.cached = cached
+	start = len(manager.surface_cache.surfaces)
+	timings = manager.run(frames = FRAMES, realtime = False)
+	return np.median(timings['render']), len(manager.surface_cache.surfaces) - start
+
+
+if __name__ == '__main__':
+	manager.init(render_mode = 'headless', canvas_size = (640, 360))
+
+	# an 8 by 4 sheet of 11x18 sprites with a colorkey, like the normal pygame example
+	sheet = pygame.Surface((88, 72))
+	sheet.fill((0, 64, 0))
+	sheet.set_colorkey((0, 64, 0))
+	for i in range(32):
+		pygame.draw.ellipse(sheet, (i * 8, 255 - i * 8, 128), ((i % 8) * 11 + 1, (i // 8) * 18 + 1, 9, 16))
+	sprites = [sheet.subsurface(((i % 8) * 11, (i // 8) * 18, 11, 18)) for i in range(32)]
+
+	rng = np.random.default_rng(1)
+	for i in range(SPRITES):
+		Spinner(sprites[i % 32], rng.uniform((0, 0), (620, 340)), rng.uniform(-90, 90))
+
+	every_frame, _ = measure(False)
+	cached, surfaces = measure(True)
+	cache = manager.surface_cache
+
+	print(f'{SPRITES} sprites, {FRAMES} frames')
+	print(f'transform every frame: {every_frame * 1000:6.2f}ms median render')
+	print(f'surface cache:         {cached * 1000:6.2f}ms median render ({every_frame / cached:.2f}x), '
+		f'{cache.hits / (cache.hits + cache.misses):.1%} hits, {surfaces} surfaces in {cache.bytes / 1024 / 1024:.1f}MiB')
@@ -0,0 +1,48 @@
+'''
+Spawns and despawns single members of a swarm stored in one `VaryFloats`,
+comparing `extend`/`delete` on plain arrays with `extend`/`remove` on a `VaryFloats` with a capacity.
+
+Run from the repository root with `python -m benchmarks.vary_floats_capacity`.
+'''
+
+import time
+
+import numpy as np
+
+from boxlet import VaryFloats
+
+
+SWARM = 20_000
+CHURN = 2_000
+
+
+def churn_plain():
+	swarm = VaryFloats(np.zeros((SWARM, 3)))
+	rng = np.random.default_rng(1)
+	start = time.perf_counter()
+	for _ in range(CHURN):
+		swarm.extend(np.ones((1, 3)))
+		swarm.delete(int(rng.integers(len(swarm.current))))
+	return time.perf_counter() - start
+
+
+def churn_capacity():
+	swarm = VaryFloats(np.zeros((SWARM, 3)), capacity = SWARM)
+	handles = list(swarm.handles)
+	rng = np.random.default_rng(1)
+	start = time.perf_counter()
+	for _ in range(CHURN):
+		handles.extend(swarm.extend(np.ones((1, 3))))
+		i = int(rng.integers(len(handles)))
+		handles[i], handles[-1] = handles[-1], handles[i]
+		swarm.remove(handles.pop())
+	return time.perf_counter() - start
+
+
+if __name__ == '__main__':
+	plain = churn_plain()
+	capacity = churn_capacity()
+
+	print(f'swarm of {SWARM}, {CHURN} spawns and despawns')
+	print(f'np.append/np.delete: {plain / CHURN * 1e6:8.2f}us per spawn and despawn')
+	print(f'capacity and handles: {capacity / CHURN * 1e6:7.2f}us per spawn and despawn ({plain / capacity:.1f}x)')
@@ -0,0 +1,72 @@
+'''
+Times `WorldSnapshot` capture and restore at 10k entities, against pickling the same entities.
+
+Run from the repository root with `python -m benchmarks.world_snapshot`.
+'''
+
+import gc
+import pickle
+import time
+
+from boxlet import ColumnEntity, Entity, WorldSnapshot, np
+
+
+ENTITY_COUNT = 10_000
+REPEATS = 100
+
+
+class Unit(Entity):
+	snapshot_fields = ('position', 'health')
+
+	def __init__(self, i) -> None:
+		self.position = np.array([i, i], float)
+		self.health = 10
+
+
+class ColumnUnit(ColumnEntity):
+	fields = {'position': (float, 2), 'velocity': (float, 2), 'health': float}
+
+
+def measure(cls):
+	if issubclass(cls, ColumnEntity):
+		cls.spawn_many(ENTITY_COUNT, position = np.random.rand(ENTITY_COUNT, 2), health = 10)
+	else:
+		for i in range(ENTITY_COUNT):
+			cls(i)
+	Entity.__add_new_entities__()
+
+	start = time.perf_counter()
+	for _ in range(REPEATS):
+		snapshot = WorldSnapshot()
+	capture = (time.perf_counter() - start) / REPEATS
+
+	restore = 0
+	for _ in range(REPEATS // 10):
+		# destroy a tenth of the world so restore has work to do
+		for e in Entity.entity_dict[cls][::10]:
+			e.destroy()
+		Entity.__destroy_entities__()
+
+		start = time.perf_counter()
+		snapshot.restore()
+		restore += time.perf_counter() - start
+	restore /= REPEATS // 10
+
+	start = time.perf_counter()
+	pickle.loads(pickle.dumps(Entity.entity_dict[cls]))
+	pickled = time.perf_counter() - start
+
+	# unpickling goes through Entity.__new__, registering the copies as well
+	Entity.__add_new_entities__()
+	for e in Entity.entity_dict[cls]:
+		e.destroy()
+	Entity.__destroy_entities__()
+	gc.collect()
+	return capture, restore, pickled
+
+
+if __name__ == '__main__':
+	print(f'{ENTITY_COUNT} entities')
+	for cls in (Unit, ColumnUnit):
+		capture, restore, pickled = measure(cls)
+		print(f'{cls.__name__:10} capture: {capture * 1000:6.3f}ms  restore: {restore * 1000:6.3f}ms  pickle round trip: {pickled * 1000:7.2f}ms')
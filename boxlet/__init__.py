@@ -2,9 +2,18 @@ import pygame
 import numpy as np
 
 from .math_extra import *
-from .entity import Entity
+from .entity import Entity, EntityView
 from .manager import instance as manager
-from .vary_floats import VaryFloats
+from .scheduler import Wait
+from .vary_floats import InterpolationArena, SharedVaryFloats, VaryFloats
+from .rotation_vary_floats import MatrixVaryFloats, QuaternionVaryFloats
+from .column_entity import ColumnEntity, ColumnStore
+from .spatial_hash import SpatialHash
+from .sprite_batch import SpriteBatch
+from .cached_layer import CachedLayer
+from .surface_cache import SurfaceCache
+from .snapshot import WorldSnapshot
+from .profiler import Profiler
 
 # if build:
 from .debug import Debug
@@ -0,0 +1,61 @@
+from . import Entity, manager, np, pygame
+
+
+class CachedLayer(Entity):
+	'''
+	Rarely changing layer, like a background or tile map, drawn once into an offscreen surface and copied onto the canvas every frame.\n
+	The surface covers the view plus `margin` pixels on every side, and is only drawn again after `invalidate()`,
+	when `manager.screen_pos` moves past the margin, or when the canvas changes size.
+	Subclasses implement `draw`, which is given the surface and the world position of its top left corner.
+	Layers are copied at render priority negative infinity, below everything else.  Subclass and decorate `render` again to copy at another priority.
+
+	```
+	class Background(CachedLayer):
+		def draw(self, surface, origin):
+			for pos, tile in tiles:
+				surface.blit(tile, pos - origin)
+	```
+	'''
+
+	def __init__(self, margin = 64, transparent = False) -> None:
+		self.margin = margin
+		self.transparent = transparent
+		'''Keeps per pixel alpha so the layers below show through, instead of filling with `manager.fill_color`.'''
+		self.surface:pygame.Surface = None
+		self.origin = np.zeros(2)
+		'''World position of the top left corner of the surface.'''
+		self.valid = False
+		self.redraws = 0
+		'''Number of times the layer was drawn.'''
+
+	def invalidate(self):
+		'''Draws the layer again before it is next copied.'''
+		self.valid = False
+
+	@Entity.priority(float('-inf'))
+	def render(self):
+		view_size = tuple(manager.canvas.get_size())
+		size = (view_size[0] + self.margin * 2, view_size[1] + self.margin * 2)
+		offset = manager.screen_pos - self.origin # view relative to the surface, inside the margin while it is within [0, 2 * margin]
+
+		if not self.valid or self.surface is None or self.surface.get_size() != size or np.any(offset < 0) or np.any(offset > self.margin * 2):
+			self.__redraw(size)
+
+		manager.canvas.blit(self.surface, self.origin - manager.screen_pos)
+
+	def __redraw(self, size:tuple[int, int]):
+		if self.surface is None or self.surface.get_size() != size:
+			self.surface = pygame.Surface(size, pygame.SRCALPHA if self.transparent else 0)
+			if pygame.display.get_surface() is not None:
+				self.surface = self.surface.convert_alpha() if self.transparent else self.surface.convert()
+
+		self.origin = np.floor(manager.screen_pos) - self.margin
+		self.surface.fill((0, 0, 0, 0) if self.transparent else manager.fill_color)
+		self.draw(self.surface, self.origin)
+		self.valid = True
+		self.redraws += 1
+		manager.damage_all()
+
+	def draw(self, surface:pygame.Surface, origin:np.ndarray):
+		'''Draws the contents of the layer onto the surface, where the world position `origin` is the top left pixel.'''
+		...
@@ -0,0 +1,174 @@
+from . import Entity, np
+
+
+class ColumnStore:
+	'''
+	Struct-of-arrays storage for the declared fields of one `ColumnEntity` type.\n
+	Rows `[0:live]` belong to entities in `Entity.entity_dict`, rows `[live:count]` to entities still waiting to be added.
+	Reading a field name from the store returns the column of live rows, and assigning to it writes into those rows.
+	'''
+
+	reserved_names = {'fields', 'capacity', 'count', 'live', 'arrays', 'owners'}
+
+	def __init__(self, fields:dict[str, tuple[np.dtype, tuple[int, ...]]], capacity = 16) -> None:
+		self.fields = fields
+		self.capacity = capacity
+		self.count = 0
+		self.live = 0
+		self.arrays = {name: np.zeros((capacity, *shape), dtype) for name, (dtype, shape) in fields.items()}
+		self.owners:list['ColumnEntity'] = []
+
+	def __getattr__(self, name):
+		arrays = self.__dict__.get('arrays', {})
+		if name in arrays:
+			return arrays[name][:self.live]
+		raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}'")
+
+	def __setattr__(self, name, value):
+		arrays = self.__dict__.get('arrays', {})
+		if name in arrays:
+			arrays[name][:self.live] = value
+		else:
+			super().__setattr__(name, value)
+
+	def __len__(self):
+		return self.live
+
+	def reserve(self, capacity:int):
+		'''Grows every column to hold at least the given number of rows.  Row views taken before growing no longer alias the columns.'''
+		if capacity <= self.capacity:
+			return
+
+		capacity = max(capacity, self.capacity * 2)
+		for name, a in self.arrays.items():
+			new_a = np.zeros((capacity, *a.shape[1:]), a.dtype)
+			new_a[:self.count] = a[:self.count]
+			self.arrays[name] = new_a
+		self.capacity = capacity
+
+	def allocate(self, ob:'ColumnEntity'):
+		'''Gives a new entity a zeroed row in the pending range.'''
+		self.reserve(self.count + 1)
+		row = self.count
+		for a in self.arrays.values():
+			a[row] = 0
+
+		ob._column_row = row
+		self.owners.append(ob)
+		self.count += 1
+
+	def allocate_many(self, obs:list['ColumnEntity']):
+		'''Gives several new entities zeroed rows in the pending range at once.'''
+		start = self.count
+		self.reserve(start + len(obs))
+		for a in self.arrays.values():
+			a[start:start + len(obs)] = 0
+
+		for row, ob in enumerate(obs, start):
+			ob._column_row = row
+		self.owners.extend(obs)
+		self.count += len(obs)
+
+	def commit(self):
+		'''Marks every pending row as live.'''
+		self.live = self.count
+
+	def release(self, ob:'ColumnEntity'):
+		'''Removes the entity's row, filling the hole with the last row of the same range.'''
+		row = ob._column_row
+		if row < self.live:
+			self.live -= 1
+			self.__move(self.live, row)
+			row = self.live
+		self.count -= 1
+		self.__move(self.count, row)
+		self.owners.pop()
+		del ob._column_row # the row now belongs to another entity, so stale field access raises instead
+
+	def __move(self, src:int, dst:int):
+		if src == dst:
+			return
+		for a in self.arrays.values():
+			a[dst] = a[src]
+		ob = self.owners[src]
+		self.owners[dst] = ob
+		ob._column_row = dst
+
+
+class Column:
+	'''Descriptor for per-entity access to a field of a `ColumnEntity`.  Fields with a shape are returned as views of the entity's row.'''
+
+	def __init__(self, name:str) -> None:
+		self.name = name
+
+	def __get__(self, ob, owner = None):
+		if ob is None:
+			return self
+		return ob._column_store.arrays[self.name][ob._column_row]
+
+	def __set__(self, ob, value):
+		ob._column_store.arrays[self.name][ob._column_row] = value
+
+
+class ColumnEntity(Entity):
+	'''
+	Entity whose declared `fields` live in NumPy columns shared by every entity of the same type.\n
+	Functions decorated with `Entity.batched` are called once per frame with the type's `ColumnStore`, instead of once per entity.
+	Fields of destroyed entities should not be accessed, as their row is handed to another entity.
+
+	```
+	class Mover(ColumnEntity):
+		fields = {'position': (float, 2), 'velocity': (float, 2), 'health': float}
+
+		@Entity.batched
+		def fixed_update(columns):
+			columns.position += columns.velocity * manager.fixed_delta_time
+	```
+	'''
+
+	fields:dict[str, type | tuple[type, int | tuple[int, ...]]] = {}
+	'''Fields stored in columns, as `name: dtype` or `name: (dtype, shape)`.  Fields of parent classes are inherited.'''
+
+	__slots__ = ('_column_row',)
+
+	_column_store:ColumnStore
+
+	def __init_subclass__(cls):
+		super().__init_subclass__()
+
+		for name in cls.__dict__.get('fields', {}):
+			if name in ColumnStore.reserved_names:
+				raise Exception(f'Field name "{name}" is reserved by ColumnStore.')
+			setattr(cls, name, Column(name))
+
+		fields = {}
+		for base in reversed(cls.__mro__):
+			for name, spec in base.__dict__.get('fields', {}).items():
+				dtype, shape = spec if isinstance(spec, tuple) else (spec, ())
+				fields[name] = (np.dtype(dtype), (shape,) if isinstance(shape, int) else tuple(shape))
+
+		cls._column_store = ColumnStore(fields)
+
+	@classmethod
+	def __entities_allocated__(cls, entities:list['ColumnEntity']):
+		with Entity.registry_lock:
+			if len(entities) == 1:
+				cls._column_store.allocate(entities[0])
+			else:
+				cls._column_store.allocate_many(entities)
+
+	@classmethod
+	def __entities_spawned__(cls, entities:list['ColumnEntity'], values:dict):
+		store = cls._column_store
+		start = entities[0]._column_row if entities else 0 # allocate_many gave them consecutive rows
+		for name, value in values.items():
+			if name in store.arrays:
+				store.arrays[name][start:start + len(entities)] = value
+		super().__entities_spawned__(entities, {name: value for name, value in values.items() if name not in store.arrays})
+
+	@classmethod
+	def __entities_added__(cls):
+		cls._column_store.commit()
+
+	def __entity_removed__(self):
+		self._column_store.release(self)
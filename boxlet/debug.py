@@ -8,11 +8,10 @@ class Debug(Entity):
 	def __init__(self, draw_func, life_time = 30) -> None:
 		self.draw_func = draw_func
 		self.life_time = life_time
+		self.timer = manager.after(life_time, self.destroy)
 
-	def fixed_update(self):
-		self.life_time -= manager.fixed_delta_time
-		if self.life_time <= 0:
-			self.destroy()
+	def on_destroy(self):
+		self.timer.cancel()
 
 	@Entity.priority(float('inf'))
 	def render(self):
@@ -0,0 +1,66 @@
+from . import pygame
+
+
+class DirtyRegions:
+	'''
+	Regions of the canvas that changed since the last frame, reported by entities through `manager.damage()`.\n
+	Overlapping or nearby regions are merged, and once the damage gets large enough the whole canvas is redrawn instead.
+
+	Every render function is called once per region, with drawing clipped to it.  This saves filling and presenting pixels,
+	but the Python work of render functions is repeated for each region, so scenes whose render functions are costly can end up slower than a full redraw.
+	Render functions with side effects, like ones spread over frames with `Entity.rate`, also advance once per region.
+	Keep `max_regions` low for such scenes, or 1 to always draw a single bounding box.
+	'''
+
+	def __init__(self, canvas_size, max_regions = 2, full_redraw_ratio = 0.5) -> None:
+		self.bounds = pygame.Rect((0, 0), tuple(canvas_size))
+		self.max_regions = max_regions
+		'''Most separate regions redrawn in a frame, render functions are called once for each.  More are merged into their bounding box.'''
+		self.full_redraw_ratio = full_redraw_ratio
+		'''Fraction of the canvas area past which the whole canvas is redrawn.'''
+		self.rects:list[pygame.Rect] = []
+		self.everything = True
+
+	def add(self, rect):
+		'''Marks the area as changed, clipped to the canvas.'''
+		rect = self.bounds.clip(rect)
+		if rect.w and rect.h:
+			self.rects.append(rect)
+
+	def add_all(self):
+		'''Marks the whole canvas as changed.'''
+		self.everything = True
+
+	def take(self) -> list[pygame.Rect] | None:
+		'''Returns the merged regions changed since the last call and forgets them, or None if the whole canvas should be redrawn.'''
+		rects, everything = self.rects, self.everything
+		self.rects = []
+		self.everything = False
+		if everything:
+			return None
+
+		merged = self.merge(rects)
+		if len(merged) > self.max_regions:
+			merged = [merged[0].unionall(merged[1:])]
+		if sum(r.w * r.h for r in merged) > self.full_redraw_ratio * self.bounds.w * self.bounds.h:
+			return None
+		return merged
+
+	@staticmethod
+	def merge(rects:list[pygame.Rect]) -> list[pygame.Rect]:
+		'''Merges rectangles that overlap, or whose bounding box is no larger than the two of them apart, until none are left to merge.'''
+		merged:list[pygame.Rect] = []
+		for rect in rects:
+			i = 0
+			while i < len(merged):
+				other = merged[i]
+				union = rect.union(other)
+				if rect.colliderect(other) or union.w * union.h <= rect.w * rect.h + other.w * other.h:
+					rect = union
+					merged[i] = merged[-1]
+					merged.pop()
+					i = 0 # the grown rectangle may now reach ones already passed
+				else:
+					i += 1
+			merged.append(rect)
+		return merged
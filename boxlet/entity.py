@@ -1,13 +1,77 @@
+from bisect import insort
+from concurrent.futures import Executor
+from itertools import chain
+from threading import Lock
 from typing import Callable, TypeVar, final
 
 
+class EntityView:
+	'''Read-only view over the live entity lists of several types, chained in registration order.\n
+	Entities added or destroyed later are reflected without creating a new view.'''
+
+	__slots__ = ('_lists',)
+
+	def __init__(self, lists:list[list['Entity']]) -> None:
+		self._lists = lists
+
+	def __iter__(self):
+		return chain.from_iterable(self._lists)
+
+	def __len__(self):
+		return sum(map(len, self._lists))
+
+	def __bool__(self):
+		return any(self._lists)
+
+	def __contains__(self, entity):
+		return any(entity in l for l in self._lists)
+
+	def __getitem__(self, index:int):
+		if index < 0:
+			index += len(self)
+		if index >= 0:
+			for l in self._lists:
+				if index < len(l):
+					return l[index]
+				index -= len(l)
+		raise IndexError('EntityView index out of range')
+
+
+class StaggeredEntities:
+	'''
+	Iterates over a different part of an entity list on each pass, so that each entity is visited once every few passes.\n
+	With `every` set, entities are spread by their index.  Otherwise each entity is visited once every `update_interval` passes.
+	'''
+
+	__slots__ = ('entities', 'every', 'tick')
+
+	def __init__(self, entities:list['Entity'], every:int | None) -> None:
+		self.entities = entities
+		self.every = every
+		self.tick = -1
+
+	def __iter__(self):
+		self.tick += 1
+		if self.every is None:
+			tick = self.tick
+			return iter([e for e in self.entities if (tick + e._entity_index) % e.update_interval == 0])
+		return iter(self.entities[self.tick % self.every::self.every])
+
+
 class Entity:
 
+	__slots__ = ('is_destroyed', '_destroy_queued', '_entity_list', '_entity_index')
+	# Subclasses without __slots__ still get a __dict__, slotted subclasses only list their own attributes.
+
 	watched_callables = ['render', 'vary_update', 'fixed_update']
 	watched_events:list[int] = []
+	immediate_events:set[int] = set()
+	'''Event ids with handlers called once for every event, see `Entity.watch_event`.'''
+	coalesced_events:set[int] = set()
+	'''Event ids with handlers called once per frame with every event of that id, see `Entity.watch_coalesced_event`.'''
 	entity_callables:dict[str, list[tuple[type, Callable]]] = {s: [] for s in watched_callables}
 	'''Dictionary of each function name and Entity types that have it, along with their callable.\n
-	Event functions are event by event's id. `f'event_{id}'`'''
+	Event functions are event by event's id. `f'event_{id}'`, or `f'coalesced_{id}'` for coalesced handlers.'''
 
 	entity_dict:dict[type, list['Entity']] = {} 
 	'''Dictionary of existing entities, organized by type.'''
@@ -21,88 +85,413 @@ class Entity:
 	entities_to_destroy:list['Entity'] = []
 	'''Dictionary of entities that need to be destroyed'''
 
+	subclass_lists:dict[type, list[list['Entity']]] = {}
+	'''Dictionary of each class, including mixins, and the entity lists of every registered type that inherits from it.'''
+
+	preserve_order = False
+	'''If True, entities of this type stay in creation order when others are destroyed.\n
+	Instead of an O(1) swap-remove per entity, the type's list is compacted once per call to `__destroy_entities__`.'''
+
+	dispatch_plans:dict[str, list[tuple[Callable, list['Entity']]]] = {}
+	'''Cached call order of each function name, as pairs of the callable and the live list of entities it is called on.\n
+	Types without entities are left out.  Plans are cleared whenever a type is registered, or gains or loses its last entity.'''
+
+	event_plans:dict[int, tuple[str | None, dict[int, list], list]] = {}
+	'''Cached dispatch of each event id, as the routed event attribute, the plans for each routed value, and the plan for any other value.'''
+
+	event_route_attributes:dict[int, str] = {}
+	'''Event attribute that handlers of each event id are routed by, see `Entity.watch_event`.'''
+
+	snapshot_fields:tuple[str, ...] = ()
+	'''Names of the attributes captured by `WorldSnapshot`.  `ColumnEntity` fields are always captured.'''
+
+	pools:dict[type, list['Entity']] = {}
+	'''Dictionary of destroyed entities kept for reuse, organized by type.'''
+
+	pool_size = 0
+	'''Maximum number of destroyed entities of this type kept for reuse by the constructor and `spawn_many`.  Reused entities are `reset()` first.'''
+
+	staggered_entities:dict[tuple[type, Callable], StaggeredEntities] = {}
+	'''Staggered iteration of each type and function decorated with `Entity.rate`, kept between dispatch plans.'''
+
+	update_interval = 1
+	'''Number of calls between each call on this entity, for functions decorated with `Entity.rate()` without `every`.\n
+	Slotted subclasses that set it per instance need to list it in their `__slots__`.'''
+
+	executor:Executor | None = None
+	'''Thread pool that runs parallel groups, set up by the manager.  Groups run one after another without it.'''
+
+	registry_lock = Lock()
+	'''Guards the registries against entities being created or destroyed from several threads.'''
+
+	class_functions:dict[type, dict[str, Callable]] = {}
+	'''Dictionary of each class, including mixins, and the watched functions defined directly in its body.'''
+
+	profiler = None
+	'''The `Profiler` timing each type's functions, set by `manager.start_profiler()`.  Dispatch plans are built without timing when None.'''
+
 	E = TypeVar('E', bound='Entity')
 	
 	def __init_subclass__(cls):
+		functions:dict[str, Callable] = {}
+		for base in reversed(cls.__mro__):
+			own = Entity.__own_functions__(base)
+			for name in [n for n in functions if n in base.__dict__ and n not in own]:
+				del functions[name] # overridden by something that isn't watched
+			functions.update(own)
+
+		for name, func in functions.items(): # checked before anything is registered, so a rejected class leaves no trace
+			if hasattr(func, '_rate') and func._rate is None and hasattr(func, '_batched'):
+				raise Exception(f'{cls.__name__}.{name} is batched, so it needs Entity.rate(every) instead of each entity\'s update_interval.')
 
-		def append_sort(c, f, name):
-			Entity.entity_callables[name].append((c, f))
-			Entity.entity_callables[name].sort(key = lambda ef: ef[1]._priority if hasattr(ef[1], '_priority') else 0)
-			# would prefer to insert the function without sorting the list every single time
+		for name, func in functions.items():
+			if name in Entity.watched_callables:
+				Entity.__insert_callable__(name, cls, func)
 
-		for func in Entity.watched_callables:
-			if hasattr(cls, func):
-				append_sort(cls, getattr(cls, func), func)
+			for w in getattr(func, '_watched_events', ()):
+				ev = f'event_{w}'
+				if w not in Entity.immediate_events:
+					Entity.immediate_events.add(w)
+					Entity.entity_callables[ev] = []
+					if w not in Entity.watched_events:
+						Entity.watched_events.append(w)
+
+				if func._event_route is not None:
+					attr = Entity.event_route_attributes.setdefault(w, func._event_route[0])
+					if attr != func._event_route[0]:
+						raise Exception(f'Handlers of event {w} are already routed by "{attr}", not "{func._event_route[0]}".')
+
+				Entity.__insert_callable__(ev, cls, func)
 
-		for attr in dir(cls):
-			func = getattr(cls, attr)
-			if callable(func) and hasattr(func, '_watched_events'):
-				for w in func._watched_events:
-					ev = f'event_{w}'
+			for w in getattr(func, '_coalesced_events', ()):
+				ev = f'coalesced_{w}'
+				if w not in Entity.coalesced_events:
+					Entity.coalesced_events.add(w)
+					Entity.entity_callables[ev] = []
 					if w not in Entity.watched_events:
 						Entity.watched_events.append(w)
-						Entity.entity_callables[ev] = []
 
-					append_sort(cls, func, ev)
+				Entity.__insert_callable__(ev, cls, func)
 
 		Entity.entity_dict[cls] = []
 		Entity.entities_to_add[cls] = []
+		Entity.pools[cls] = []
+		Entity.__clear_plans__()
+
+		for base in cls.__mro__:
+			Entity.subclass_lists.setdefault(base, []).append(Entity.entity_dict[cls])
+
+	@staticmethod
+	def __own_functions__(c:type) -> dict[str, Callable]:
+		'''Returns the watched functions defined directly in the body of the given class, caching the result.'''
+		own = Entity.class_functions.get(c)
+		if own is None:
+			own = {}
+			for name, value in c.__dict__.items():
+				if name in Entity.watched_callables or hasattr(value, '_watched_events') or hasattr(value, '_coalesced_events'):
+					func = getattr(c, name)
+					if callable(func):
+						own[name] = func
+			Entity.class_functions[c] = own
+		return own
+
+	@staticmethod
+	def __insert_callable__(name:str, c:type, func:Callable):
+		'''Inserts the function after every other function of the same or lower priority.'''
+		insort(Entity.entity_callables[name], (c, func), key = lambda cf: getattr(cf[1], '_priority', 0))
 
 	def __new__(cls, *args, **kwargs):
-		ob = super(Entity, cls).__new__(cls)
-		
+		pool = Entity.pools[cls]
+		with Entity.registry_lock:
+			ob = pool.pop() if pool else None
+
+		reused = ob is not None
+		if not reused:
+			ob = super(Entity, cls).__new__(cls)
+
+		cls.__entities_allocated__([ob])
+		if reused:
+			ob.reset()
 		Entity.__append_entity__(cls, ob)
 		
 		return ob
 
+	@classmethod
+	def spawn_many(cls:type[E], n:int, **values) -> list[E]:
+		'''
+		Creates `n` entities without calling `__init__` and registers them with a single list extend.\n
+		Each keyword argument is set as an attribute on every new entity.  `ColumnEntity` fields are instead written to the new rows at once, 
+		so they can also be given one value per entity.
+		'''
+		pool = Entity.pools[cls]
+		with Entity.registry_lock:
+			reused = pool[max(len(pool) - n, 0):]
+			del pool[len(pool) - len(reused):]
+
+		alloc = super(Entity, cls).__new__
+		entities = reused + [alloc(cls) for _ in range(n - len(reused))]
+		cls.__entities_allocated__(entities)
+		for ob in reused:
+			ob.reset()
+
+		new_entities = Entity.entities_to_add[cls]
+		with Entity.registry_lock:
+			for i, ob in enumerate(entities, len(new_entities)):
+				ob.is_destroyed = False
+				ob._destroy_queued = False
+				ob._entity_list = new_entities
+				ob._entity_index = i
+			new_entities.extend(entities)
+			Entity.new_created.add(cls)
+
+		cls.__entities_spawned__(entities, values)
+		return entities
+
 	@classmethod
 	def __append_entity__(cls, sub_cls, ob):
 		ob.is_destroyed = False
-		
-		Entity.entities_to_add[sub_cls].append(ob)
-		Entity.new_created.add(sub_cls)
+		ob._destroy_queued = False
+
+		new_entities = Entity.entities_to_add[sub_cls]
+		with Entity.registry_lock:
+			ob._entity_list = new_entities
+			ob._entity_index = len(new_entities)
+			new_entities.append(ob)
+			Entity.new_created.add(sub_cls)
 
 	@staticmethod
 	def __add_new_entities__():
 		''' Adds all recently created entities to their list.'''
 		for t in Entity.new_created:
-			Entity.entity_dict[t].extend(Entity.entities_to_add[t])
-			Entity.entities_to_add[t].clear()
+			new_entities = Entity.entities_to_add[t]
+			if not new_entities:
+				continue
+
+			entities = Entity.entity_dict[t]
+			if not entities:
+				Entity.__clear_plans__()
+
+			for i, e in enumerate(new_entities, len(entities)):
+				e._entity_list = entities
+				e._entity_index = i
+
+			entities.extend(new_entities)
+			new_entities.clear()
+			t.__entities_added__()
 
 		Entity.new_created.clear()
 
 	@staticmethod
 	def __destroy_entities__():
+		'''Removes all entities that have been destroyed since the last call.\n
+		Entities are swap-removed from their list, unless their type sets `preserve_order`.'''
+		ordered_lists = {}
+
 		while Entity.entities_to_destroy:
 			e = Entity.entities_to_destroy.pop()
+			e.is_destroyed = True
+			e.__entity_removed__()
+			entities = e._entity_list
+
 			t = type(e)
-			for d in (Entity.entity_dict, Entity.entities_to_add):
-				if e in d[t]:
-					d[t].remove(e)
-					e.is_destroyed = True
-					break
+			if t.pool_size and len(Entity.pools[t]) < t.pool_size:
+				Entity.pools[t].append(e)
+
+			if t.preserve_order:
+				ordered_lists[id(entities)] = entities
+				continue
+
+			last = entities.pop()
+			if last is not e:
+				entities[e._entity_index] = last
+				last._entity_index = e._entity_index
+			elif not entities:
+				Entity.__clear_plans__()
+
+		for entities in ordered_lists.values():
+			entities[:] = [e for e in entities if not e.is_destroyed]
+			for i, e in enumerate(entities):
+				e._entity_index = i
+
+			if not entities:
+				Entity.__clear_plans__()
+
+	@staticmethod
+	def __clear_plans__():
+		Entity.dispatch_plans.clear()
+		Entity.event_plans.clear()
+
+	@staticmethod
+	def __plan_entries__(name:str):
+		'''Returns the type, callable and what it is called on for each function with the given name, skipping types that have no entities.'''
+		entries = []
+		for t, f in Entity.entity_callables[name]:
+			if not Entity.entity_dict[t]:
+				continue
+
+			entities = (t._column_store,) if hasattr(f, '_batched') else Entity.entity_dict[t]
+			if hasattr(f, '_rate'):
+				if (t, f) not in Entity.staggered_entities:
+					Entity.staggered_entities[(t, f)] = StaggeredEntities(entities, f._rate)
+				entities = Entity.staggered_entities[(t, f)]
+
+			entries.append((t, f, entities))
+		return entries
+
+	@staticmethod
+	def __build_dispatch_plan__(name:str):
+		'''
+		Creates and caches the call order for the given function name.\n
+		Consecutive functions in parallel groups are merged into one entry that runs each group with `__run_parallel__`.
+		While `Entity.profiler` is set, each function is replaced by an entry that times its calls.
+		'''
+		plan = []
+		groups = None
+		for t, f, entities in Entity.__plan_entries__(name):
+			group = getattr(f, '_parallel_group', None)
+			if Entity.profiler is not None:
+				f, entities = Entity.profiler.timed(t, name, f, entities)
+
+			if group is None:
+				plan.append((f, entities))
+				groups = None
+				continue
+
+			if groups is None:
+				groups = {}
+				plan.append((Entity.__run_parallel__, (groups,)))
+			groups.setdefault(group, []).append((f, entities))
+
+		Entity.dispatch_plans[name] = plan
+		return plan
+
+	@staticmethod
+	def __run_parallel__(groups:dict[str, list[tuple[Callable, list['Entity']]]], *param):
+		'''Runs each group's functions in order, with the groups spread over `Entity.executor`.'''
+		def run_group(entries):
+			for f, entities in entries:
+				for e in entities:
+					f(e, *param)
+
+		entries = list(groups.values())
+		if Entity.executor is None:
+			for group in entries:
+				run_group(group)
+			return
+
+		futures = [Entity.executor.submit(run_group, group) for group in entries[1:]]
+		run_group(entries[0])
+		for future in futures:
+			future.result()
 
 	@staticmethod
 	def __call_function__(name:str, *param):
 		'''Calls all related functions based on priority.'''
-		for t, f in Entity.entity_callables[name]:
-			for e in Entity.entity_dict[t]:
-				f(e, *param)
+		plan = Entity.dispatch_plans.get(name)
+		if plan is None:
+			plan = Entity.__build_dispatch_plan__(name)
+
+		if param:
+			for f, entities in plan:
+				for e in entities:
+					f(e, *param)
+		else: # unpacking an empty tuple is still noticeably slower than a plain call
+			for f, entities in plan:
+				for e in entities:
+					f(e)
+
+	@staticmethod
+	def __build_event_plan__(event_type:int):
+		'''Creates and caches the dispatch of the given event id, with a separate plan for each routed value.'''
+		handlers = Entity.__plan_entries__(f'event_{event_type}')
+		values = {v for _, f, _ in handlers if f._event_route is not None for v in f._event_route[1]}
+
+		default = [(f, entities) for _, f, entities in handlers if f._event_route is None]
+		routed = {v: [(f, entities) for _, f, entities in handlers if f._event_route is None or v in f._event_route[1]] for v in values}
+
+		route = (Entity.event_route_attributes.get(event_type), routed, default)
+		Entity.event_plans[event_type] = route
+		return route
 
 	@staticmethod
 	def __call_event_function__(event_type:int, event):
 		'''Calls all related functions based on priority. \n\n If the function returns true than it considers the event used'''
-		for t, f in Entity.entity_callables[f'event_{event_type}']:
-			for e in Entity.entity_dict[t]:
+		route = Entity.event_plans.get(event_type)
+		if route is None:
+			route = Entity.__build_event_plan__(event_type)
+
+		attr, routed, plan = route
+		if attr is not None:
+			plan = routed.get(getattr(event, attr, None), plan)
+
+		for f, entities in plan:
+			for e in entities:
 				if f(e, event):
 					return
 
+	@staticmethod
+	def __call_coalesced_function__(event_type:int, events:list):
+		'''Calls all coalesced handlers of the event id based on priority, with the list of events or the total of their attribute.'''
+		name = f'coalesced_{event_type}'
+		plan = Entity.dispatch_plans.get(name)
+		if plan is None:
+			plan = Entity.dispatch_plans[name] = [(f, entities) for _, f, entities in Entity.__plan_entries__(name)]
+
+		totals = {}
+		for f, entities in plan:
+			attr = f._coalesced_total
+			if attr is None:
+				value = events
+			elif attr in totals:
+				value = totals[attr]
+			else:
+				value = totals[attr] = Entity.__event_total__(events, attr)
+
+			for e in entities:
+				f(e, value)
+
+	@staticmethod
+	def __event_total__(events:list, attr:str):
+		'''Sums the attribute over the events, element by element for sequences like `rel`.'''
+		values = [getattr(event, attr) for event in events]
+		if isinstance(values[0], (tuple, list)):
+			return tuple(map(sum, zip(*values)))
+		return sum(values)
+
+	@classmethod
+	def __entities_allocated__(cls, entities:list['Entity']):
+		'''Called with new or reused entities before they are reset and registered, to give them any storage they need.'''
+		pass
+
+	@classmethod
+	def __entities_spawned__(cls, entities:list['Entity'], values:dict):
+		'''Called with the entities created by `spawn_many` and the values they should be given.'''
+		for name, value in values.items():
+			for ob in entities:
+				setattr(ob, name, value)
+
+	@classmethod
+	def __entities_added__(cls):
+		'''Called on a type after its recently created entities were moved into `entity_dict`.'''
+		pass
+
+	def __entity_removed__(self):
+		'''Called when `__destroy_entities__` takes the entity out of its list.'''
+		pass
+
 	@final
 	def destroy(self):
 		'''Removes entity from the list and memory.'''
-		if self not in Entity.entities_to_destroy:
+		with Entity.registry_lock:
+			if self._destroy_queued:
+				return
+			self._destroy_queued = True
 			Entity.entities_to_destroy.append(self)
-			self.on_destroy()
+		self.on_destroy()
+
+	def reset(self):
+		'''Called when a destroyed entity is taken from its type's pool to be reused, before `__init__` or `spawn_many` values are applied.\n\nThis function is meant to be overloaded.'''
+		pass
 
 	def on_destroy(self):
 		'''Called when the object is destroyed by calling `Entity.destroy()`.\n\nThis function is meant to be overloaded.'''
@@ -118,21 +507,85 @@ class Entity:
 		return wrap
 	
 	@staticmethod
-	def watch_event(*events):
-		'''Decorator to note that the function should be called during the specified events.'''
+	def parallel_group(name:str):
+		'''
+		Decorator to put the function in a named update group.  Groups that are next to each other in priority order run at the same time on `Entity.executor`.\n
+		Functions of different groups must not share mutable state.  Creating and destroying entities is safe, 
+		though a group should not create entities of a `ColumnEntity` type whose columns another group is using.
+		'''
+		def wrap(func):
+			assert isinstance(func, Callable)
+			func._parallel_group = name
+			return func
+		return wrap
+
+	@staticmethod
+	def rate(every:int = None):
+		'''
+		Decorator to call the function on each entity only once every few calls, spreading the entities evenly over the calls in between.\n
+		Without `every`, each entity's `update_interval` is used instead.
+		That still checks every entity in Python on each call, only the skipped calls are saved, while `every` slices the list.
+		Batched functions need `every`, the store is called as one entity once every `every` calls.
+		Functions that depend on time should scale it by the interval, like `manager.fixed_delta_time * 4`.
+		Entities are picked by their index, and destroying an entity moves the last one into its place,
+		so that entity may be called early, late or twice within one interval, and the scaled time is only right on average.
+		'''
+		def wrap(func):
+			assert isinstance(func, Callable)
+			func._rate = every
+			return func
+		return wrap
+
+	@staticmethod
+	def batched(func):
+		'''
+		Decorator to call the function once per type instead of once per entity.  Only usable on `ColumnEntity` types.\n
+		The function receives the type's `ColumnStore` in place of `self`.
+		'''
+		assert isinstance(func, Callable)
+		func._batched = True
+		return func
+
+	@staticmethod
+	def watch_event(*events, **route):
+		'''
+		Decorator to note that the function should be called during the specified events.\n
+		A single keyword argument routes the events by one of their attributes, so the function is only called for the given value or values.
+		`@Entity.watch_event(pygame.KEYDOWN, key = pygame.K_ESCAPE)`
+		'''
+		assert len(route) <= 1, 'Events can only be routed by a single attribute.'
 		def wrap(func):
 			assert isinstance(func, Callable)
 			func._watched_events = events
+			func._event_route = None
+			for attr, values in route.items():
+				func._event_route = (attr, frozenset(values if isinstance(values, (tuple, list, set, frozenset)) else (values,)))
+			return func
+		return wrap
+
+	@staticmethod
+	def watch_coalesced_event(*events, total:str = None):
+		'''
+		Decorator to call the function once per frame with every event of the specified ids that happened during it,
+		instead of once per event, after the events handled one by one.\n
+		The function receives the list of events, or with `total` the sum of that attribute over them.
+		`@Entity.watch_coalesced_event(pygame.MOUSEMOTION, total = 'rel')` receives a tuple of the summed movement.
+		'''
+		def wrap(func):
+			assert isinstance(func, Callable)
+			func._coalesced_events = events
+			func._coalesced_total = total
 			return func
 		return wrap
 
 	@staticmethod
-	def all_of_parent_class(s_class:type[E]) -> list[E]:
-		'''Returns all object that are the given class or a subclass of the given class.'''
-		entities = []
-		for t, l in Entity.entity_dict.items():
-			if issubclass(t, s_class):
-				entities.extend(l)
-		# entities = [e for t, l in Entity.entity_dict.items() if issubclass(t, s_class) for e in l]
-		# TODO test performance
-		return entities
\ No newline at end of file
+	def all_of_parent_class(s_class:type[E], snapshot = False) -> EntityView | list[E]:
+		'''
+		Returns all object that are the given class or a subclass of the given class.\n
+		By default this is a lazy `EntityView` over the live lists.
+		Set `snapshot` to get a copied list instead, for when entities are added or removed while iterating.
+		'''
+		lists = Entity.subclass_lists.setdefault(s_class, [])
+		if snapshot:
+			return [e for l in lists for e in l]
+		return EntityView(lists)
@@ -0,0 +1,83 @@
+import time
+
+
+class FramePacer:
+	'''
+	Waits for the end of each frame by sleeping until shortly before the deadline and spinning only for the remaining `slack` seconds,
+	instead of spinning for the whole wait like `pygame.time.Clock.tick_busy_loop`.\n
+	Deadlines follow a fixed schedule, so a frame that ends early does not push the next one back.
+	A frame that misses its deadline by more than a whole frame restarts the schedule instead of rushing to catch up.
+	'''
+
+	def __init__(self, slack = 0.002, smoothing = 0.0) -> None:
+		self.slack = slack
+		'''Seconds before the deadline to stop sleeping and start spinning, covering how late the OS may wake the thread.'''
+		self.smoothing = smoothing
+		'''Weight of the previous value when smoothing frame times, from 0 for no smoothing up to but excluding 1.'''
+		self.deadline:float | None = None
+		self.last_frame = time.perf_counter()
+
+		self.frame_time:float | None = None
+		'''The last value returned by `smooth`.'''
+		self.frames = 0
+		self.missed = 0
+		'''Number of frames that ended after their deadline.'''
+		self.total_lateness = 0.0
+		self.max_lateness = 0.0
+		self.max_oversleep = 0.0
+		'''Longest time a sleep went past the point it was meant to wake at, useful for tuning `slack`.'''
+
+	def wait(self, fps:float) -> float:
+		'''Waits until the end of the frame at the given frames per second, returning the seconds since the last call.'''
+		interval = 1 / fps
+		now = time.perf_counter()
+		if self.deadline is None:
+			self.deadline = now + interval
+
+		remaining = self.deadline - now
+		if remaining < 0:
+			self.missed += 1
+			self.total_lateness -= remaining
+			self.max_lateness = max(self.max_lateness, -remaining)
+			if remaining < -interval:
+				self.deadline = now
+		else:
+			if remaining > self.slack:
+				wake = self.deadline - self.slack
+				time.sleep(remaining - self.slack)
+				self.max_oversleep = max(self.max_oversleep, time.perf_counter() - wake)
+
+			while time.perf_counter() < self.deadline:
+				pass
+
+		self.deadline += interval
+		self.frames += 1
+
+		now = time.perf_counter()
+		elapsed = now - self.last_frame
+		self.last_frame = now
+		return elapsed
+
+	def smooth(self, frame_time:float) -> float:
+		'''Blends the frame time with the previously smoothed frame times, evening out jitter in the time passed to each frame.'''
+		if self.frame_time is None or not self.smoothing:
+			self.frame_time = frame_time
+		else:
+			self.frame_time = self.smoothing * self.frame_time + (1 - self.smoothing) * frame_time
+		return self.frame_time
+
+	def reset(self):
+		'''Restarts the deadline schedule, like after the game was paused or minimized.'''
+		self.deadline = None
+		self.last_frame = time.perf_counter()
+
+	def stats(self) -> dict[str, float]:
+		'''Returns the number of frames and missed deadlines, with the mean and worst lateness of missed frames in seconds.'''
+		return {
+			'frames': self.frames,
+			'missed': self.missed,
+			'missed_ratio': self.missed / self.frames if self.frames else 0.0,
+			'mean_lateness': self.total_lateness / self.missed if self.missed else 0.0,
+			'max_lateness': self.max_lateness,
+			'max_oversleep': self.max_oversleep,
+		}
@@ -1,12 +1,25 @@
+import os
 import time
+from contextlib import nullcontext
+from concurrent.futures import ThreadPoolExecutor
 
 from . import Entity, clamp, np, pygame
+from .dirty_regions import DirtyRegions
+from .frame_pacer import FramePacer
+from .profiler import Profiler
+from .scheduler import Coroutine, Scheduler, Timer
+from .simulation_thread import SimulationThread
+from .surface_cache import SurfaceCache
+from .vary_floats import InterpolationArena
 	
 class ExitGame(Exception):
 	'Exception to quickly exit game'
 
 class Manager:
 
+	phases = ('events', 'fixed_update', 'vary_update', 'add_entities', 'destroy_entities', 'render', 'frame')
+	'''Phases of each frame timed by `run`, where frame is the total of the others.'''
+
 	def __init__(self) -> None:
 		pygame.init()
 
@@ -17,12 +30,21 @@ class Manager:
 			vsync = False,
 			target_frames_per_second = 120,
 			target_updates_per_second = 60,
+			worker_threads = None,
+			frame_pacing_slack = 0.002,
+			frame_time_smoothing = 0.0,
+			simulation_thread = False,
 			**kwargs
 			):
 
 		self.fullscreen = fullscreen
 		
 		self.render_mode = render_mode
+		self.dirty_regions:DirtyRegions | None = None # set with dirty_rects in sdl2 and headless mode, see damage
+		if self.render_mode != 'headless' and pygame.display.get_init() and pygame.display.get_driver() == 'dummy' and os.environ.get('SDL_VIDEODRIVER') != 'dummy':
+			# left over from an earlier headless init, open a real display again
+			pygame.display.quit()
+			pygame.display.init()
 		if self.render_mode == 'sdl2':
 			self.vsync = 0
 			self.screen_pos = np.zeros(2)
@@ -30,16 +52,24 @@ class Manager:
 				self.display = pygame.display.set_mode(flags = pygame.DOUBLEBUF | pygame.FULLSCREEN)
 			else:
 				self.display = pygame.display.set_mode(display_size, flags = pygame.DOUBLEBUF)
-
-			self.fill_color = kwargs.get('fill_color', 'black')
-			if self.fill_color.count(',') > 0: # instead create a list
-				self.fill_color = [int(c) for c in self.fill_color.split(',')]
-
-			self.canvas_size = np.array(kwargs.get('canvas_size', (0,0)), dtype=int)
-			if 0 in self.canvas_size:
-				self.canvas_size = np.array(display_size, dtype=int)
-			self.canvas = pygame.surface.Surface(self.canvas_size)
+			self.__init_canvas(display_size, kwargs)
 		
+		elif self.render_mode == 'headless':
+			# no window or graphics context, render functions draw onto a canvas that is never shown
+			self.vsync = 0
+			self.screen_pos = np.zeros(2)
+			pygame.display.quit()
+			driver = os.environ.get('SDL_VIDEODRIVER')
+			os.environ['SDL_VIDEODRIVER'] = 'dummy'
+			pygame.display.init()
+			# only the display initialized here uses the dummy driver, later ones pick the driver as before
+			if driver is None:
+				del os.environ['SDL_VIDEODRIVER']
+			else:
+				os.environ['SDL_VIDEODRIVER'] = driver
+			self.display = pygame.display.set_mode(display_size)
+			self.__init_canvas(display_size, kwargs)
+
 		elif self.render_mode == 'opengl':
 			self.vsync = vsync
 
@@ -71,6 +101,8 @@ class Manager:
 		# self.screen_size[:] = self.display.get_size()
 
 		self.clock = pygame.time.Clock()
+		# sleeps through most of each frame when vsync is off, spinning only for the last `frame_pacing_slack` seconds
+		self.frame_pacer = FramePacer(frame_pacing_slack, frame_time_smoothing)
 
 		self.fps = target_frames_per_second # frames per second, may get replaced by turning on vsync
 		self.ups = target_updates_per_second # fixed updates per second
@@ -81,12 +113,30 @@ class Manager:
 		self.fixed_time = 0 # fixed time since start
 		self.system_time = time.time() # system time
 		self.interpolate_time = 0 # interpolation between fixed updates for vary updates
+		self.scheduler = Scheduler(self.fixed_delta_time) # timers and coroutines, advanced every fixed update
+		self.profiler:Profiler | None = None # records frame timings while set, see start_profiler
+		self.simulation_thread = simulation_thread # runs fixed updates on their own thread while running in real time, see SimulationThread
+		self.simulation:SimulationThread | None = None # the running simulation thread, whose lock guards the scheduler
 
 		pygame.joystick.init()
 		self.joysticks = []
 		self.current_joystick = None
 
-	def run(self):
+		# runs functions in Entity.parallel_group groups, threads are only started once groups are used
+		if Entity.executor is not None: # from an earlier init
+			Entity.executor.shutdown()
+		Entity.executor = ThreadPoolExecutor(worker_threads, thread_name_prefix = 'boxlet')
+
+	def run(self, frames:int = None, fixed_dt:float = None, realtime = True) -> dict[str, np.ndarray] | None:
+		'''
+		Runs the game loop until the game exits, or for the given number of frames.\n
+		`fixed_dt` replaces the time between fixed updates.
+		Without `realtime`, each frame advances the time by exactly `1 / target_frames_per_second` without waiting, so runs are deterministic.
+		When `frames` is given, returns the seconds spent in each phase of every frame, keyed by the names in `Manager.phases`.
+
+		With `simulation_thread` set in `init` and `realtime`, fixed updates run on a `SimulationThread` instead of in the frame,
+		and `interpolate_time` follows the wall clock time since the last one finished.
+		'''
 		pygame.event.set_blocked(None)
 		pygame.event.set_allowed(Entity.watched_events)
 		pygame.event.set_allowed([pygame.WINDOWEXPOSED, pygame.JOYDEVICEADDED, pygame.JOYDEVICEREMOVED, pygame.QUIT])
@@ -94,64 +144,153 @@ class Manager:
 		if self.render_mode == 'vulkan':
 			self.vulkan_graphics_engine.finalize_setup()
 
+		if fixed_dt is not None:
+			self.fixed_delta_time = fixed_dt
+			self.max_delta_time = fixed_dt * 3
+			self.scheduler.tick_length = fixed_dt
+
+		timings = None if frames is None else np.zeros((len(Manager.phases), frames))
+		frame = 0
+		exited = False
+
+		simulation = None
+		if self.simulation_thread and realtime:
+			simulation = self.simulation = SimulationThread(self)
+			simulation.start()
+			simulated_steps = 0
+
 		self.system_time = time.time()
 		try:
-			while True:
-				for _ in pygame.event.get(eventtype=pygame.WINDOWEXPOSED):
-					self.system_time = time.time() # this still does not help every case it freezes, maybe have a maximum delta time.
-
-				if not pygame.display.get_active():
+			while frames is None or frame < frames:
+				t_start = time.perf_counter()
+				if realtime and not pygame.display.get_active():
+					# other events stay queued until the window is active again, so none are lost while minimized
+					for event in pygame.event.get(eventtype = (pygame.WINDOWEXPOSED, pygame.QUIT)):
+						if event.type == pygame.QUIT:
+							self.quit()
 					self.system_time = time.time()
 					self.clock.tick(60)
+					self.frame_pacer.reset()
 					continue
 
-				new_system_time = time.time()
-				self.delta_time = clamp(new_system_time - self.system_time, 0, self.max_delta_time)
+				events = pygame.event.get() # only allowed event types are queued
+				if realtime:
+					for event in events:
+						if event.type == pygame.WINDOWEXPOSED:
+							self.system_time = time.time() # this still does not help every case it freezes, maybe have a maximum delta time.
+							self.damage_all()
+
+					new_system_time = time.time()
+					self.delta_time = self.frame_pacer.smooth(clamp(new_system_time - self.system_time, 0, self.max_delta_time))
+					self.system_time = new_system_time
+				else:
+					self.delta_time = 1 / self.fps
 				self.time += self.delta_time
-				self.system_time = new_system_time
-
-				for event in pygame.event.get(Entity.watched_events, False):
-					Entity.__call_event_function__(event.type, event)
 
-				for event in pygame.event.get([pygame.JOYDEVICEADDED, pygame.JOYDEVICEREMOVED], False):
-					self.joysticks = [pygame.joystick.Joystick(x) for x in range(pygame.joystick.get_count())]
-					if event.type == pygame.JOYDEVICEADDED:
-						self.current_joystick = self.joysticks[event.device_index]
-					elif self.current_joystick.get_instance_id() == event.instance_id:
-						self.current_joystick = None
-
-				for event in pygame.event.get(pygame.QUIT, False):
-					self.quit()
-
-				pygame.event.clear(pump=False)
+				immediate, coalesced = Entity.immediate_events, Entity.coalesced_events
+				coalesced_lists:dict[int, list] = {}
+				for event in events:
+					t = event.type
+					if t in immediate:
+						Entity.__call_event_function__(t, event)
+					if t in coalesced:
+						coalesced_lists.setdefault(t, []).append(event)
+
+					if t == pygame.JOYDEVICEADDED or t == pygame.JOYDEVICEREMOVED:
+						self.joysticks = [pygame.joystick.Joystick(x) for x in range(pygame.joystick.get_count())]
+						if t == pygame.JOYDEVICEADDED:
+							self.current_joystick = self.joysticks[event.device_index]
+						elif self.current_joystick.get_instance_id() == event.instance_id:
+							self.current_joystick = None
+
+					elif t == pygame.QUIT:
+						self.quit()
+
+				for t, type_events in coalesced_lists.items():
+					Entity.__call_coalesced_function__(t, type_events)
+				t_events = time.perf_counter()
 				
-				for i in range(5):
-					if self.time >= self.fixed_time + self.fixed_delta_time:
-						self.fixed_time += self.fixed_delta_time
-						Entity.__call_function__('fixed_update')
-					else:
-						break
-				
-				self.interpolate_time = clamp((self.time - self.fixed_time) / self.fixed_delta_time, 0, 1)
-
+				fixed_steps = 0
+				if simulation is None:
+					for i in range(5):
+						if self.time >= self.fixed_time + self.fixed_delta_time:
+							self.fixed_time += self.fixed_delta_time
+							self.scheduler.update()
+							Entity.__call_function__('fixed_update')
+							fixed_steps += 1
+						else:
+							break
+
+					self.interpolate_time = clamp((self.time - self.fixed_time) / self.fixed_delta_time, 0, 1)
+				else:
+					if simulation.error is not None:
+						raise simulation.error
+					fixed_steps = simulation.steps - simulated_steps
+					simulated_steps += fixed_steps
+					self.interpolate_time = simulation.interpolate_time()
+				t_fixed = time.perf_counter()
+
+				InterpolationArena.interpolate_all(self.interpolate_time)
 				Entity.__call_function__('vary_update')
-				Entity.__add_new_entities__()
-				Entity.__destroy_entities__()
+				t_vary = time.perf_counter()
+				if simulation is None:
+					Entity.__add_new_entities__()
+					t_add = time.perf_counter()
+					Entity.__destroy_entities__()
+				else:
+					with simulation.lock:
+						Entity.__add_new_entities__()
+						t_add = time.perf_counter()
+						Entity.__destroy_entities__()
+				t_destroy = time.perf_counter()
 				
 				self.__render()	
+				t_render = time.perf_counter()
 
-				if not self.vsync:
-					self.clock.tick_busy_loop(self.fps)
+				if realtime and not self.vsync:
+					self.frame_pacer.wait(self.fps)
+
+				if timings is not None or self.profiler is not None:
+					phase_times = (t_events - t_start, t_fixed - t_events, t_vary - t_fixed, t_add - t_vary, t_destroy - t_add, t_render - t_destroy, t_render - t_start)
+					if timings is not None:
+						timings[:, frame] = phase_times
+					if self.profiler is not None:
+						self.profiler.record_frame(t_start, phase_times, fixed_steps)
+				frame += 1
 
 		except ExitGame:
+			exited = True
+
+		finally:
+			if simulation is not None:
+				simulation.stop()
+				self.simulation = None
+
+		if exited:
 			self.__close()
 
+		if timings is not None:
+			return dict(zip(Manager.phases, timings[:, :frame]))
+
 	def __render(self):
 		if self.render_mode == 'sdl2':
-			self.canvas.fill(self.fill_color)
-			Entity.__call_function__('render')
-			pygame.transform.scale(self.canvas, self.display.get_size(), self.display)
-			pygame.display.update()
+			regions = None if self.dirty_regions is None else self.dirty_regions.take()
+			if regions is None:
+				self.canvas.fill(self.fill_color)
+				Entity.__call_function__('render')
+				pygame.transform.scale(self.canvas, self.display.get_size(), self.display)
+				pygame.display.update()
+			elif regions:
+				self.__render_regions(regions)
+				pygame.display.update([self.__present_region(r) for r in regions])
+
+		elif self.render_mode == 'headless':
+			regions = None if self.dirty_regions is None else self.dirty_regions.take()
+			if regions is None:
+				self.canvas.fill(self.fill_color)
+				Entity.__call_function__('render')
+			else:
+				self.__render_regions(regions)
 		
 		elif self.render_mode == 'vulkan':
 			self.vulkan_graphics_engine.render()
@@ -160,6 +299,42 @@ class Manager:
 			self.boxlet_gl.render()
 			pygame.display.flip()
 
+	def __render_regions(self, regions:list[pygame.Rect]):
+		'''Clears and redraws each region of the canvas, calling the render functions once per region with drawing clipped to it.'''
+		for r in regions:
+			self.canvas.set_clip(r)
+			self.canvas.fill(self.fill_color, r)
+			Entity.__call_function__('render')
+		self.canvas.set_clip(None)
+
+	def __present_region(self, r:pygame.Rect) -> pygame.Rect:
+		'''
+		Copies a region of the canvas to the display, scaling it like the whole canvas is scaled, and returns the area of the display it covers.\n
+		Edges are rounded per region, so with a scale that is not a whole number the result can differ from scaling the whole canvas by a pixel along region edges.
+		'''
+		display_size = self.display.get_size()
+		if tuple(self.canvas_size) == display_size:
+			return self.display.blit(self.canvas, r, r)
+
+		sx, sy = display_size[0] / self.canvas_size[0], display_size[1] / self.canvas_size[1]
+		left, top = int(r.left * sx), int(r.top * sy)
+		target = pygame.Rect(left, top, int(r.right * sx) - left, int(r.bottom * sy) - top)
+		pygame.transform.scale(self.canvas.subsurface(r), target.size, self.display.subsurface(target))
+		return target
+
+	def damage(self, rect):
+		'''
+		Marks an area of the canvas, in canvas pixels, as changed so it is redrawn when `dirty_rects` was set in `init`.\n
+		Moving things should damage both where they were and where they are now.
+		'''
+		if self.dirty_regions is not None:
+			self.dirty_regions.add(rect)
+
+	def damage_all(self):
+		'''Marks the whole canvas as changed, like after the camera moved.'''
+		if self.dirty_regions is not None:
+			self.dirty_regions.add_all()
+
 	def set_display(self, display_size = None, canvas_size = None, fullscreen = None, vsync = None):
 		self.fullscreen = fullscreen
 		if not self.fullscreen and not display_size:
@@ -176,6 +351,9 @@ class Manager:
 			if 0 in self.canvas_size:
 				self.canvas_size = np.array(display_size, dtype=int)
 			self.canvas = pygame.surface.Surface(self.canvas_size)
+			if self.dirty_regions is not None:
+				self.dirty_regions = DirtyRegions(self.canvas_size, self.dirty_regions.max_regions, self.dirty_regions.full_redraw_ratio)
+			self.surface_cache.clear() # converted to the old display's format
 
 		elif self.render_mode == 'opengl':
 			self.vsync = vsync or self.vsync
@@ -188,6 +366,54 @@ class Manager:
 			...
 			# TODO
 
+	def __init_canvas(self, display_size, kwargs:dict):
+		'''Sets up the canvas drawn onto in sdl2 and headless mode, from the options given to `init`.'''
+		self.fill_color = kwargs.get('fill_color', 'black')
+		if self.fill_color.count(',') > 0: # instead create a list
+			self.fill_color = [int(c) for c in self.fill_color.split(',')]
+
+		self.canvas_size = np.array(kwargs.get('canvas_size', (0,0)), dtype=int)
+		if 0 in self.canvas_size:
+			self.canvas_size = np.array(display_size, dtype=int)
+		self.canvas = pygame.surface.Surface(self.canvas_size)
+		if kwargs.get('dirty_rects', False):
+			self.dirty_regions = DirtyRegions(self.canvas_size)
+		self.surface_cache = SurfaceCache(kwargs.get('surface_cache_bytes', 64 * 1024 * 1024))
+
+	def after(self, seconds:float, func, *args) -> Timer:
+		'Calls the function once after the given number of seconds of fixed time.'
+		with self.__scheduler_lock():
+			return self.scheduler.after(seconds, func, *args)
+
+	def every(self, seconds:float, func, *args, delay:float = None) -> Timer:
+		'Calls the function every given number of seconds of fixed time, until the returned timer is cancelled.'
+		with self.__scheduler_lock():
+			return self.scheduler.every(seconds, func, *args, delay = delay)
+
+	def start_coroutine(self, generator) -> Coroutine:
+		'Runs a generator as a coroutine, which can `yield Wait(seconds)` to pause.'
+		with self.__scheduler_lock():
+			return self.scheduler.start_coroutine(generator)
+
+	def __scheduler_lock(self):
+		'''The simulation thread advances the scheduler while holding its lock, so timers started from other threads take it too.'''
+		return nullcontext() if self.simulation is None else self.simulation.lock
+
+	def start_profiler(self, capacity = 600) -> Profiler:
+		'''Starts recording the timings of each phase and each entity type's functions for the last `capacity` frames.'''
+		self.profiler = Profiler(Manager.phases, capacity)
+		Entity.profiler = self.profiler
+		Entity.__clear_plans__()
+		return self.profiler
+
+	def stop_profiler(self) -> Profiler | None:
+		'''Stops recording frame timings, returning the profiler so its results can still be read.'''
+		profiler = self.profiler
+		self.profiler = None
+		Entity.profiler = None
+		Entity.__clear_plans__()
+		return profiler
+
 	def quit(self):
 		'Exits the program immediately by raising exception ExitGame.'
 		raise ExitGame()
@@ -196,6 +422,9 @@ class Manager:
 		if self.render_mode == 'vulkan':
 			self.vulkan_graphics_engine.close()
 
+		Entity.executor.shutdown()
+		Entity.executor = None
+
 		pygame.quit()
 
 instance = Manager()
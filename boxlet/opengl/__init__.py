@@ -18,6 +18,7 @@ from .render_bases.render_pass import PassOpaque
 from .render_targets.render_target_frame_buffer import FrameBufferStep, ApplyShaderToFrame, ApplyDitherToFrame, SimpleClearStep
 from .render_targets.camera_3d import Camera3D
 from .render_targets.camera_2d import Camera2D
+from .render_targets.cached_layer_step import CachedLayerStep
 from .renderers.terrain_renderer import TerrainRenderer
 from .renderers.instanced_renderer import InstancedRenderer
 
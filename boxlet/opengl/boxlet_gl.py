@@ -21,6 +21,9 @@ class BoxletGL:
 			BoxletGL.sort_pass_order()
 
 		for target in BoxletGL.render_targets:
+			if not target.should_render():
+				continue
+
 			target.prepare()
 
 			for pass_name in target.pass_names:
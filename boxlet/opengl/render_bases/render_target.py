@@ -7,6 +7,10 @@ class RenderTarget:
 		self.pass_names = pass_names or []
 		BoxletGL.add_render_target(self)
 	
+	def should_render(self) -> bool:
+		'Checked every frame before rendering, returning False skips the target and its passes for the frame.'
+		return True
+
 	def prepare(self):
 		...
 	
@@ -0,0 +1,102 @@
+from OpenGL.GL import *
+
+from .. import BoxletGL, Model, VertFragShader, np
+from .camera_2d import Camera2D
+
+
+class CachedLayerStep(Camera2D):
+	vertex_layer_shader = """
+		#version 330 core
+		layout (location = 0) in vec2 position;
+		layout (location = 1) in vec2 texcoord;
+
+		uniform vec2 box_cameraSize;
+		uniform vec2 box_cameraPos;
+
+		uniform vec2 layerPos;
+		uniform vec2 layerSize;
+		uniform float layerDepth;
+
+		out vec2 uv;
+
+		void main() {
+			vec2 worldPos = layerPos + position * layerSize * 0.5;
+			gl_Position = vec4((worldPos - box_cameraPos) * 2 / box_cameraSize, layerDepth, 1.0);
+			uv = texcoord;
+		}
+		"""
+
+	fragment_layer_shader = """
+		#version 330 core
+		out vec4 FragColor;
+		in vec2 uv;
+		uniform sampler2D layerTexture;
+		void main() {
+			FragColor = vec4(texture(layerTexture, uv).rgb, 1.0);
+		}
+		"""
+
+	shader = None
+	rect_vao = None
+
+	def __init__(self, camera:Camera2D, margin = 64, composite_pass = 'default', depth_value = 0.999, nearest = True, queue = -100, pass_names:list[str] = None) -> None:
+		'''
+		Renders its passes into a frame buffer covering the view of the given camera plus `margin` pixels on every side,
+		and draws that texture into the camera's `composite_pass` every frame, behind anything closer than `depth_value`.\n
+		The passes are only rendered again after `invalidate()`, when the camera moves past the margin or zooms, or when the camera's size changes.
+		The layer's passes should be separate from the camera's, like `pass_names = ['background']`.
+		'''
+
+		self.camera = camera
+		self.margin = margin
+		self.valid = False
+		self.redraws = 0
+		'''Number of times the layer was rendered.'''
+
+		super().__init__(depth = True, nearest = nearest, queue = queue, pass_names = pass_names)
+		self.depth_value = depth_value
+		self._built_size = self.get_size()
+
+		if CachedLayerStep.shader is None:
+			CachedLayerStep.shader = VertFragShader(CachedLayerStep.vertex_layer_shader, CachedLayerStep.fragment_layer_shader)
+			CachedLayerStep.rect_vao = glGenVertexArrays(1)
+			glBindVertexArray(CachedLayerStep.rect_vao)
+			Model.gen_quad_2d().bind(CachedLayerStep.shader)
+			glBindVertexArray(0)
+
+		BoxletGL.add_render_call(composite_pass, CachedLayerStep.shader, self.composite)
+
+	def get_size(self):
+		width, height = self.camera.get_size()
+		return [width + self.margin * 2, height + self.margin * 2]
+
+	def invalidate(self):
+		'Renders the layer again on the next frame.'
+		self.valid = False
+
+	def should_render(self) -> bool:
+		size = self.get_size()
+		if size != self._built_size:
+			self._built_size = size
+			self.rebuild()
+			self.valid = False
+
+		moved = np.any(np.abs(self.camera.position - self.position) > self.margin * self.camera.zoom)
+		if self.valid and not moved and self.zoom == self.camera.zoom:
+			return False
+
+		self.position[:] = self.camera.position
+		self.zoom = self.camera.zoom
+		self.valid = True
+		self.redraws += 1
+		return True
+
+	def composite(self):
+		'Draws the cached texture where it lies in the world, called within the camera\'s composite pass.'
+		shader = CachedLayerStep.shader
+		BoxletGL.bind_vao(CachedLayerStep.rect_vao)
+		shader.bind_texture('layerTexture', self.texture)
+		shader.apply_uniform('layerPos', self.position)
+		shader.apply_uniform('layerSize', [i * self.zoom for i in self._built_size])
+		shader.apply_uniform('layerDepth', self.depth_value)
+		glDrawElements(GL_TRIANGLES, 6, GL_UNSIGNED_INT, None)
@@ -0,0 +1,153 @@
+import json
+import time
+from typing import Callable
+
+from . import np
+
+
+class FunctionTimer:
+	'''Time spent in one function of one entity type during each profiled frame.'''
+
+	__slots__ = ('name', 'elapsed', 'times')
+
+	def __init__(self, name:str, capacity:int) -> None:
+		self.name = name
+		self.elapsed = 0.0
+		'''Seconds spent in the function so far this frame.'''
+		self.times = np.zeros(capacity)
+
+
+class TimedEntry:
+	'''Dispatch plan entry that calls a function on every entity and adds the time it took to a `FunctionTimer`.'''
+
+	__slots__ = ('timer', 'func', 'entities')
+
+	def __init__(self, timer:FunctionTimer, func:Callable, entities) -> None:
+		self.timer = timer
+		self.func = func
+		self.entities = entities
+
+	def __call__(self, _, *param):
+		f = self.func
+		start = time.perf_counter()
+		for e in self.entities:
+			f(e, *param)
+		self.timer.elapsed += time.perf_counter() - start
+
+
+class Profiler:
+	'''
+	Ring buffer of the time spent in each phase of the last `capacity` frames of `manager.run`,
+	along with the time spent in each entity type's functions.\n
+	Created by `manager.start_profiler()`.  When no profiler is running, neither the frame loop nor the dispatch plans do any extra work.
+	'''
+
+	def __init__(self, phases:tuple[str, ...], capacity = 600) -> None:
+		self.phases = phases
+		self.capacity = capacity
+		self.frame_count = 0
+		'''Number of frames recorded, including those already overwritten.'''
+		self.frame_starts = np.zeros(capacity)
+		'''`time.perf_counter()` at the start of each frame.'''
+		self.phase_times = np.zeros((len(phases), capacity))
+		self.fixed_steps = np.zeros(capacity, int)
+		'''Number of fixed updates run in each frame.'''
+		self.functions:dict[tuple[type, str], FunctionTimer] = {}
+
+	def timed(self, t:type, name:str, f:Callable, entities) -> tuple[TimedEntry, tuple[None]]:
+		'''Returns a dispatch plan entry that calls the function on the entities and times it.'''
+		timer = self.functions.get((t, name))
+		if timer is None:
+			timer = self.functions[(t, name)] = FunctionTimer(f'{t.__name__}.{name}', self.capacity)
+		return TimedEntry(timer, f, entities), (None,)
+
+	def record_frame(self, start:float, phase_times:tuple[float, ...], fixed_steps:int):
+		'''Stores the timings of one frame, overwriting the oldest frame once the buffer is full.'''
+		slot = self.frame_count % self.capacity
+		self.frame_starts[slot] = start
+		self.phase_times[:, slot] = phase_times
+		self.fixed_steps[slot] = fixed_steps
+		for timer in self.functions.values():
+			timer.times[slot] = timer.elapsed
+			timer.elapsed = 0.0
+		self.frame_count += 1
+
+	def __order(self):
+		'''Indices of the buffered frames from oldest to newest.'''
+		if self.frame_count <= self.capacity:
+			return np.arange(self.frame_count)
+		return np.arange(self.frame_count, self.frame_count + self.capacity) % self.capacity
+
+	def phase(self, name:str) -> np.ndarray:
+		'''Returns the seconds spent in the phase for each buffered frame, oldest first.'''
+		return self.phase_times[self.phases.index(name), self.__order()]
+
+	def function(self, name:str) -> np.ndarray:
+		'''Returns the seconds spent in the function, named like `"Player.fixed_update"`, for each buffered frame, oldest first.'''
+		for timer in self.functions.values():
+			if timer.name == name:
+				return timer.times[self.__order()]
+		raise KeyError(name)
+
+	def summary(self) -> dict[str, dict[str, dict[str, float]]]:
+		'''Returns the mean, p50, p95, p99 and max seconds per frame of each phase and function over the buffered frames.'''
+		order = self.__order()
+
+		def stats(times:np.ndarray):
+			if not len(times):
+				return {'mean': 0.0, 'p50': 0.0, 'p95': 0.0, 'p99': 0.0, 'max': 0.0}
+			p50, p95, p99 = np.percentile(times, (50, 95, 99))
+			return {'mean': float(times.mean()), 'p50': float(p50), 'p95': float(p95), 'p99': float(p99), 'max': float(times.max())}
+
+		return {
+			'frames': {'count': len(order), 'fixed_steps': stats(self.fixed_steps[order])},
+			'phases': {name: stats(times[order]) for name, times in zip(self.phases, self.phase_times)},
+			'functions': {timer.name: stats(timer.times[order]) for timer in self.functions.values()},
+		}
+
+	def clear(self):
+		'''Forgets every recorded frame.'''
+		self.frame_count = 0
+		for timer in self.functions.values():
+			timer.times[:] = 0
+
+	def to_json(self, path:str = None) -> str:
+		'''Returns the summary as JSON, also writing it to the file if given.'''
+		text = json.dumps(self.summary(), indent = '\t')
+		if path is not None:
+			with open(path, 'w') as file:
+				file.write(text)
+		return text
+
+	def to_chrome_trace(self, path:str) -> None:
+		'''
+		Writes the buffered frames in the Chrome trace event format, viewable in `chrome://tracing` or Perfetto.\n
+		Phases are spans on the main thread, each function's time per frame is a counter grouped by function name.
+		'''
+		events = []
+		order = self.__order()
+		origin = self.frame_starts[order[0]] if len(order) else 0.0
+		frame = self.phases.index('frame') if 'frame' in self.phases else None
+
+		for slot in order:
+			ts = (self.frame_starts[slot] - origin) * 1e6
+			if frame is not None:
+				events.append({'name': 'frame', 'ph': 'X', 'pid': 0, 'tid': 0, 'ts': ts, 'dur': self.phase_times[frame, slot] * 1e6})
+
+			# every phase other than the frame total runs one after another
+			phase_ts = ts
+			for i, name in enumerate(self.phases):
+				if i == frame:
+					continue
+				dur = self.phase_times[i, slot] * 1e6
+				events.append({'name': name, 'ph': 'X', 'pid': 0, 'tid': 0, 'ts': phase_ts, 'dur': dur})
+				phase_ts += dur
+
+			counters:dict[str, dict[str, float]] = {}
+			for (t, name), timer in self.functions.items():
+				counters.setdefault(name, {})[t.__name__] = timer.times[slot] * 1000
+			for name, args in counters.items():
+				events.append({'name': f'{name} (ms)', 'ph': 'C', 'pid': 0, 'ts': ts, 'args': args})
+
+		with open(path, 'w') as file:
+			json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, file)
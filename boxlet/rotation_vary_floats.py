@@ -0,0 +1,184 @@
+import numpy as np
+
+from .vary_floats import InterpolationArena, VaryFloats
+
+# quaternions are (x, y, z, w), and matrices use row vectors like util_3d.Transform, with the basis in rows 0:3 and the translation in row 3
+
+
+def normalize_rows(a:np.ndarray, out:np.ndarray = None) -> np.ndarray:
+	'''Divides each vector along the last axis by its length, leaving zero vectors as they are.'''
+	length = np.sqrt(np.einsum('...i,...i->...', a, a))[..., None]
+	length[length == 0] = 1
+	return np.divide(a, length, out = out)
+
+def quaternion_nlerp(a:np.ndarray, b:np.ndarray, t, out:np.ndarray = None) -> np.ndarray:
+	'''Normalized linear interpolation between arrays of quaternions along the shorter arc.  Cheaper than slerp, with uneven speed over large angles.'''
+	sign = np.where(np.einsum('...i,...i->...', a, b) < 0, -1.0, 1.0)[..., None]
+	result = a + (b * sign - a) * t
+	return normalize_rows(result, out)
+
+def quaternion_slerp(a:np.ndarray, b:np.ndarray, t, out:np.ndarray = None) -> np.ndarray:
+	'''Spherical linear interpolation between arrays of quaternions along the shorter arc, at constant angular speed.'''
+	d = np.einsum('...i,...i->...', a, b)
+	sign = np.where(d < 0, -1.0, 1.0)
+	d = np.minimum(np.abs(d), 1)
+	theta = np.arccos(d)
+	s = np.sin(theta)
+	near = s < 1e-6 # nearly equal quaternions fall back to lerp instead of dividing by zero
+	s[near] = 1
+	t = np.asarray(t, float)
+	wa = np.where(near, 1 - t, np.sin((1 - t) * theta) / s)
+	wb = np.where(near, t, np.sin(t * theta) / s) * sign
+	return normalize_rows(a * wa[..., None] + b * wb[..., None], out)
+
+def quaternion_to_matrix(q:np.ndarray) -> np.ndarray:
+	'''Converts (..., 4) unit quaternions to (..., 3, 3) rotation matrices whose rows are the rotated x, y and z axes.'''
+	x, y, z, w = np.moveaxis(q, -1, 0)
+	m = np.empty((*q.shape[:-1], 3, 3))
+	m[..., 0, 0] = 1 - 2 * (y * y + z * z)
+	m[..., 0, 1] = 2 * (x * y + z * w)
+	m[..., 0, 2] = 2 * (x * z - y * w)
+	m[..., 1, 0] = 2 * (x * y - z * w)
+	m[..., 1, 1] = 1 - 2 * (x * x + z * z)
+	m[..., 1, 2] = 2 * (y * z + x * w)
+	m[..., 2, 0] = 2 * (x * z + y * w)
+	m[..., 2, 1] = 2 * (y * z - x * w)
+	m[..., 2, 2] = 1 - 2 * (x * x + y * y)
+	return m
+
+def matrix_to_quaternion(m:np.ndarray) -> np.ndarray:
+	'''Converts (..., 3, 3) rotation matrices, rows being the rotated axes, to (..., 4) unit quaternions.'''
+	m00, m01, m02 = m[..., 0, 0], m[..., 0, 1], m[..., 0, 2]
+	m10, m11, m12 = m[..., 1, 0], m[..., 1, 1], m[..., 1, 2]
+	m20, m21, m22 = m[..., 2, 0], m[..., 2, 1], m[..., 2, 2]
+
+	# magnitudes from the diagonal, signs from the off diagonal differences, without branching per matrix
+	q = np.empty((*m.shape[:-2], 4))
+	q[..., 0] = np.copysign(np.sqrt(np.maximum(0, 1 + m00 - m11 - m22)), m12 - m21)
+	q[..., 1] = np.copysign(np.sqrt(np.maximum(0, 1 - m00 + m11 - m22)), m20 - m02)
+	q[..., 2] = np.copysign(np.sqrt(np.maximum(0, 1 - m00 - m11 + m22)), m01 - m10)
+	q[..., 3] = np.sqrt(np.maximum(0, 1 + m00 + m11 + m22))
+	normalize_rows(q, q)
+
+	half_turns = q[..., 3] < 1e-3 # the differences vanish near 180 degrees and no longer give the signs
+	if np.any(half_turns):
+		q[half_turns] = _half_turn_quaternion(m[half_turns])
+	return q
+
+def _half_turn_quaternion(m:np.ndarray) -> np.ndarray:
+	'''Quaternions of (n, 3, 3) rotation matrices, each computed from its largest component, with the signs of the others from the off diagonal sums.'''
+	diagonal = np.einsum('nii->ni', m)
+	largest = np.argmax(diagonal, -1)
+	q = np.empty((len(m), 4))
+	for axis in range(3):
+		rows = largest == axis
+		if not np.any(rows):
+			continue
+		n, d = m[rows], diagonal[rows]
+		i, j, k = axis, (axis + 1) % 3, (axis + 2) % 3
+		r = np.sqrt(np.maximum(0, 1 + d[:, i] - d[:, j] - d[:, k]))
+		r[r == 0] = 1
+		part = np.empty((len(n), 4))
+		part[:, i] = r / 2
+		part[:, j] = (n[:, i, j] + n[:, j, i]) / (2 * r)
+		part[:, k] = (n[:, i, k] + n[:, k, i]) / (2 * r)
+		part[:, 3] = (n[:, j, k] - n[:, k, j]) / (2 * r)
+		q[rows] = part
+	return normalize_rows(q, q)
+
+def decompose_matrices(m:np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+	'''
+	Splits (..., 4, 4) affine matrices into (..., 3) translations, (..., 4) rotations and (..., 3) scales.\n
+	Shear is not kept, and a mirrored basis is stored as a negative x scale.
+	'''
+	basis = m[..., :3, :3]
+	scale = np.sqrt(np.einsum('...ij,...ij->...i', basis, basis))
+	x, y, z = basis[..., 0, :], basis[..., 1, :], basis[..., 2, :]
+	det = x[..., 0] * (y[..., 1] * z[..., 2] - y[..., 2] * z[..., 1]) - x[..., 1] * (y[..., 0] * z[..., 2] - y[..., 2] * z[..., 0]) + x[..., 2] * (y[..., 0] * z[..., 1] - y[..., 1] * z[..., 0])
+	scale[..., 0] *= np.where(det < 0, -1, 1)
+	safe = np.where(scale == 0, 1, scale)
+	rotation = matrix_to_quaternion(basis / safe[..., None])
+	return m[..., 3, :3].copy(), rotation, scale
+
+def compose_matrices(translation:np.ndarray, rotation:np.ndarray, scale:np.ndarray, out:np.ndarray = None) -> np.ndarray:
+	'''Builds (..., 4, 4) affine matrices from translations, quaternion rotations and scales, the inverse of `decompose_matrices`.'''
+	if out is None:
+		out = np.empty((*translation.shape[:-1], 4, 4))
+	out[..., :3, :3] = quaternion_to_matrix(rotation) * scale[..., None]
+	out[..., :3, 3] = 0
+	out[..., 3, :3] = translation
+	out[..., 3, 3] = 1
+	return out
+
+def matrix_interpolate(a:np.ndarray, b:np.ndarray, t, out:np.ndarray = None, slerp = True) -> np.ndarray:
+	'''Interpolates arrays of affine matrices by their translation, rotation and scale, so rotating objects keep their size and shape.'''
+	ta, ra, sa = decompose_matrices(a)
+	tb, rb, sb = decompose_matrices(b)
+	rotation = quaternion_slerp(ra, rb, t) if slerp else quaternion_nlerp(ra, rb, t)
+	return compose_matrices(ta + (tb - ta) * t, rotation, sa + (sb - sa) * t, out)
+
+
+class QuaternionArena(InterpolationArena):
+	'''Arena of quaternions, interpolated with slerp, or with nlerp once `slerp` is False.'''
+
+	def __init__(self, slerp = True, capacity = 1024) -> None:
+		self.slerp = slerp
+		super().__init__((4,), capacity)
+
+	def interpolate(self, t:float):
+		used = self.used
+		if self.slerp:
+			quaternion_slerp(self.previous[:used], self.current[:used], t, self.out[:used])
+		else:
+			quaternion_nlerp(self.previous[:used], self.current[:used], t, self.out[:used])
+
+
+class MatrixArena(InterpolationArena):
+	'''Arena of affine 4x4 matrices, decomposed, interpolated and recomposed together.'''
+
+	def __init__(self, slerp = True, capacity = 256) -> None:
+		self.slerp = slerp
+		super().__init__((4, 4), capacity)
+
+	def interpolate(self, t:float):
+		used = self.used
+		matrix_interpolate(self.previous[:used], self.current[:used], t, self.out[:used], self.slerp)
+
+
+class QuaternionVaryFloats(VaryFloats):
+	'''
+	Previous and current rotations as (x, y, z, w) quaternions, in an array whose last axis has 4 values.\n
+	Interpolates along the shorter arc with slerp, or with the cheaper nlerp after `QuaternionVaryFloats.arena.slerp = False`.
+	Registered instances are interpolated together in the type's own arena.
+	'''
+
+	arena = QuaternionArena()
+
+	def __init__(self, values=None, size=None, capacity:int = None) -> None:
+		super().__init__(values, size, capacity)
+		if self.current.shape[-1:] != (4,):
+			raise Exception('Invalid Input')
+
+	def interpolate(self, t, out:np.ndarray = None) -> np.ndarray:
+		if type(self).arena.slerp:
+			return quaternion_slerp(self.previous, self.current, t, out)
+		return quaternion_nlerp(self.previous, self.current, t, out)
+
+
+class MatrixVaryFloats(VaryFloats):
+	'''
+	Previous and current affine 4x4 model matrices, like `Transform.model_matrix`, in an array ending with shape (4, 4).\n
+	Interpolates by decomposing into translation, rotation and scale, interpolating those, and building the matrices again,
+	so objects turning between fixed updates do not shrink or shear the way they would with the matrices lerped directly.
+	Shear is not kept.
+	'''
+
+	arena = MatrixArena()
+
+	def __init__(self, values=None, size=None, capacity:int = None) -> None:
+		super().__init__(values, size, capacity)
+		if self.current.shape[-2:] != (4, 4):
+			raise Exception('Invalid Input')
+
+	def interpolate(self, t, out:np.ndarray = None) -> np.ndarray:
+		return matrix_interpolate(self.previous, self.current, t, out, type(self).arena.slerp)
@@ -0,0 +1,142 @@
+from typing import Callable, Generator
+
+
+class Wait:
+	'''Yielded by a coroutine to pause it for the given number of seconds of fixed time.'''
+
+	__slots__ = ('seconds',)
+
+	def __init__(self, seconds:float) -> None:
+		self.seconds = seconds
+
+
+class Timer:
+	'''A pending call in a `Scheduler`, returned by `after` and `every`.'''
+
+	__slots__ = ('deadline', 'interval', 'func', 'args', 'cancelled')
+
+	def __init__(self, deadline:int, interval:int, func:Callable, args:tuple) -> None:
+		self.deadline = deadline
+		self.interval = interval
+		self.func = func
+		self.args = args
+		self.cancelled = False
+
+	def cancel(self):
+		'''Stops the timer from firing again.'''
+		self.cancelled = True
+
+
+class Coroutine:
+	'''
+	A generator resumed by a `Scheduler`.\n
+	`yield Wait(seconds)` pauses it for a number of seconds, any other yielded value pauses it until the next fixed update.
+	'''
+
+	__slots__ = ('generator', 'scheduler', 'timer', 'finished')
+
+	def __init__(self, generator:Generator, scheduler:'Scheduler') -> None:
+		self.generator = generator
+		self.scheduler = scheduler
+		self.timer:Timer = None
+		self.finished = False
+
+	def resume(self):
+		try:
+			wait = next(self.generator)
+		except StopIteration:
+			self.finished = True
+			return
+
+		self.timer = self.scheduler.after(wait.seconds if isinstance(wait, Wait) else 0, self.resume)
+
+	def cancel(self):
+		'''Stops the coroutine, closing its generator.'''
+		if self.timer is not None:
+			self.timer.cancel()
+		self.generator.close()
+		self.finished = True
+
+
+class Scheduler:
+	'''
+	Hierarchical timer wheel counting fixed updates.\n
+	Each level has 64 slots, a timer is placed in the lowest level its delay fits in and moved down as the wheel turns.
+	A fixed update only looks at a single slot, so pending timers cost nothing until they are due.
+	'''
+
+	slot_bits = 6
+	level_count = 4
+
+	def __init__(self, tick_length:float) -> None:
+		self.tick_length = tick_length
+		self.tick = 0
+		self.levels:list[list[list[Timer]]] = [[[] for _ in range(1 << self.slot_bits)] for _ in range(self.level_count)]
+		self.overflow:list[Timer] = []
+		'''Timers past the range of the top level.'''
+
+	def after(self, seconds:float, func:Callable, *args) -> Timer:
+		'''Calls the function once after the given number of seconds, rounded to fixed updates.'''
+		timer = Timer(self.tick + self.__ticks(seconds), 0, func, args)
+		self.__insert(timer)
+		return timer
+
+	def every(self, seconds:float, func:Callable, *args, delay:float = None) -> Timer:
+		'''Calls the function repeatedly every given number of seconds, first after `delay` if given, until the timer is cancelled.'''
+		interval = self.__ticks(seconds)
+		timer = Timer(self.tick + (interval if delay is None else self.__ticks(delay)), interval, func, args)
+		self.__insert(timer)
+		return timer
+
+	def start_coroutine(self, generator:Generator) -> Coroutine:
+		'''Runs the generator until its first yield, then resumes it as it asks.'''
+		coroutine = Coroutine(generator, self)
+		coroutine.resume()
+		return coroutine
+
+	def update(self):
+		'''Advances the wheel by one fixed update, calling every timer that is due.'''
+		self.tick += 1
+		t = self.tick
+
+		bits = self.slot_bits
+		mask = (1 << bits) - 1
+		for level in range(1, self.level_count + 1):
+			if t & ((1 << (bits * level)) - 1):
+				break
+
+			if level == self.level_count:
+				timers, self.overflow = self.overflow, []
+			else:
+				slots = self.levels[level]
+				slot = (t >> (bits * level)) & mask
+				timers, slots[slot] = slots[slot], []
+
+			for timer in timers:
+				self.__insert(timer)
+
+		slots = self.levels[0]
+		due = slots[t & mask]
+		if not due:
+			return
+		slots[t & mask] = []
+
+		for timer in due:
+			if timer.cancelled:
+				continue
+			timer.func(*timer.args)
+			if timer.interval and not timer.cancelled:
+				timer.deadline += timer.interval
+				self.__insert(timer)
+
+	def __ticks(self, seconds:float):
+		return max(1, round(seconds / self.tick_length))
+
+	def __insert(self, timer:Timer):
+		delay = timer.deadline - self.tick
+		bits = self.slot_bits
+		for level, slots in enumerate(self.levels):
+			if delay < 1 << (bits * (level + 1)):
+				slots[(timer.deadline >> (bits * level)) & ((1 << bits) - 1)].append(timer)
+				return
+		self.overflow.append(timer)
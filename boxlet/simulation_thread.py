@@ -0,0 +1,73 @@
+import time
+from threading import Event, RLock, Thread
+from typing import TYPE_CHECKING
+
+from . import Entity, clamp
+
+if TYPE_CHECKING:
+	from .manager import Manager
+
+
+class SimulationThread:
+	'''
+	Runs the scheduler and `fixed_update` functions of a manager on their own thread, at a steady rate from the wall clock,
+	while the main thread handles events, `vary_update` and rendering.\n
+	The main thread only changes the entity registries while holding `lock`, which is held for each fixed update,
+	so fixed updates never see entities being added or removed.
+	`manager.after`, `manager.every` and `manager.start_coroutine` take it as well, since the scheduler is advanced on this thread.
+	It is reentrant, so fixed updates can start timers too.
+	Everything else runs at the same time, so state read by `vary_update` and render functions should be handed over
+	through `SharedVaryFloats`, which fixed updates replace without the reader ever seeing a half written value.
+	'''
+
+	max_catch_up = 5
+	'''Most fixed updates run back to back after falling behind, before skipping ahead like `Manager.run` does.'''
+
+	def __init__(self, manager:'Manager') -> None:
+		self.manager = manager
+		self.lock = RLock()
+		self.steps = 0
+		'''Number of fixed updates run so far.'''
+		self.step_time = time.perf_counter()
+		'''`time.perf_counter()` when the last fixed update finished.'''
+		self.error:BaseException | None = None
+		'''Exception raised on the thread, including `ExitGame`, to be raised again on the main thread.'''
+
+		self.stopping = Event()
+		self.thread = Thread(target = self.__loop, name = 'boxlet-simulation', daemon = True)
+
+	def start(self):
+		self.step_time = time.perf_counter()
+		self.thread.start()
+
+	def stop(self):
+		'''Waits for the current fixed update to finish and stops the thread.'''
+		self.stopping.set()
+		self.thread.join()
+
+	def interpolate_time(self) -> float:
+		'''Fraction of a fixed update passed since the last one finished, for interpolating between its previous and current values.'''
+		return clamp((time.perf_counter() - self.step_time) / self.manager.fixed_delta_time, 0, 1)
+
+	def __loop(self):
+		manager = self.manager
+		next_step = time.perf_counter() + manager.fixed_delta_time
+		try:
+			while not self.stopping.is_set():
+				wait = next_step - time.perf_counter()
+				if wait > 0:
+					self.stopping.wait(wait)
+					continue
+
+				with self.lock:
+					manager.fixed_time += manager.fixed_delta_time
+					manager.scheduler.update()
+					Entity.__call_function__('fixed_update')
+				self.step_time = time.perf_counter()
+				self.steps += 1
+
+				next_step += manager.fixed_delta_time
+				if self.step_time - next_step > manager.fixed_delta_time * self.max_catch_up:
+					next_step = self.step_time
+		except BaseException as e:
+			self.error = e
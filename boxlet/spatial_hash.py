@@ -0,0 +1,145 @@
+from itertools import product
+
+from . import Entity, np
+
+
+class SpatialHash(Entity):
+	'''
+	Uniform grid over the positions of every entity of a tracked class, for proximity queries and broadphase pairs.\n
+	The grid is rebuilt in bulk at the start of each fixed update, so queries see the positions from the start of the step.
+	Positions are read from a `ColumnEntity` column when the tracked type has one with the given name,
+	otherwise from the attribute of each entity, like `Transform.position`.
+	'''
+
+	def __init__(self, tracked:type, cell_size:float, dimensions = 2, position_attribute = 'position') -> None:
+		assert dimensions in (2, 3)
+		self.tracked = tracked
+		self.cell_size = cell_size
+		self.dimensions = dimensions
+		self.position_attribute = position_attribute
+
+		# cells are packed into a single int64 key, each axis supports about +-2^30 (2D) or +-2^20 (3D) cells
+		bits = 63 // dimensions
+		self._bias = 1 << (bits - 1)
+		self._strides = np.array([1 << (bits * (dimensions - 1 - i)) for i in range(dimensions)], np.int64)
+		self._neighbor_keys = np.array([o for o in product((-1, 0, 1), repeat = dimensions) if o > (0,) * dimensions], np.int64) @ self._strides
+
+		self._types:list[type] = []
+		self._type_count = 0
+		self.rebuild()
+
+	@Entity.priority(float('-inf'))
+	def fixed_update(self):
+		self.rebuild()
+
+	def rebuild(self):
+		'''Gathers the positions of all tracked entities and sorts them by cell.'''
+		if self._type_count != len(Entity.entity_dict):
+			self._type_count = len(Entity.entity_dict)
+			self._types = [t for t in Entity.entity_dict if issubclass(t, self.tracked)]
+
+		attr, dims = self.position_attribute, self.dimensions
+		entities = []
+		positions = []
+		for t in self._types:
+			store = getattr(t, '_column_store', None)
+			if store is not None and attr in store.arrays:
+				if store.live:
+					entities.extend(store.owners[:store.live])
+					positions.append(store.arrays[attr][:store.live, :dims])
+
+			elif Entity.entity_dict[t]:
+				entities.extend(Entity.entity_dict[t])
+				positions.append(np.array([getattr(e, attr)[:dims] for e in Entity.entity_dict[t]], float))
+
+		self.entities:list[Entity] = entities
+		self.positions = np.concatenate(positions) if positions else np.zeros((0, dims))
+
+		keys = self.__keys(self.__cells(self.positions))
+		self.order = np.argsort(keys, kind = 'stable')
+		self.sorted_keys = keys[self.order]
+
+		if entities:
+			self.low = self.positions.min(axis = 0)
+			self.high = self.positions.max(axis = 0)
+
+	def query_radius(self, center, radius:float) -> list[Entity]:
+		'''Returns the entities within the given distance of the center.'''
+		return [self.entities[i] for i in self.__radius_indices(np.asarray(center, float), radius)]
+
+	def query_aabb(self, low, high) -> list[Entity]:
+		'''Returns the entities inside the axis aligned box between the low and high corners.'''
+		low, high = np.asarray(low, float), np.asarray(high, float)
+		idx = self.__box_indices(low, high)
+		pos = self.positions[idx]
+		idx = idx[np.all((pos >= low) & (pos <= high), axis = 1)]
+		return [self.entities[i] for i in idx]
+
+	def nearest(self, point, max_distance = float('inf')) -> Entity | None:
+		'''Returns the closest entity to the point, or None if there is none within the maximum distance.'''
+		if not self.entities:
+			return None
+
+		point = np.asarray(point, float)
+		# past this radius every entity is included
+		limit = min(max_distance, np.linalg.norm(np.maximum(np.abs(point - self.low), np.abs(point - self.high))))
+		radius = self.cell_size
+
+		while True:
+			radius = min(radius, limit)
+			idx = self.__radius_indices(point, radius)
+			if len(idx):
+				d = np.sum((self.positions[idx] - point) ** 2, axis = 1)
+				return self.entities[idx[np.argmin(d)]]
+			if radius >= limit:
+				return None
+			radius *= 2
+
+	def candidate_pair_indices(self) -> np.ndarray:
+		'''Returns an (n, 2) array of indices into `entities` for every pair in the same or neighboring cells.  Each pair appears once.'''
+		n = len(self.entities)
+		s = np.arange(n)
+		keys = self.sorted_keys
+
+		pairs = [self.__expand(s, s + 1, np.searchsorted(keys, keys, 'right'))]
+		for offset in self._neighbor_keys:
+			k = keys + offset
+			pairs.append(self.__expand(s, np.searchsorted(keys, k, 'left'), np.searchsorted(keys, k, 'right')))
+
+		return self.order[np.concatenate(pairs, axis = 1).T]
+
+	def candidate_pairs(self) -> list[tuple[Entity, Entity]]:
+		'''Returns every pair of entities in the same or neighboring cells.  Each pair appears once.'''
+		return [(self.entities[i], self.entities[j]) for i, j in self.candidate_pair_indices().tolist()]
+
+	def __cells(self, positions):
+		return np.floor(positions / self.cell_size).astype(np.int64)
+
+	def __keys(self, cells):
+		return (cells + self._bias) @ self._strides
+
+	def __radius_indices(self, center, radius:float):
+		idx = self.__box_indices(center - radius, center + radius)
+		d = np.sum((self.positions[idx] - center) ** 2, axis = 1)
+		return idx[d <= radius * radius]
+
+	def __box_indices(self, low, high):
+		'''Returns the indices of entities in every cell overlapping the box.'''
+		low_cell, high_cell = self.__cells(low), self.__cells(high)
+		if np.prod(high_cell - low_cell + 1) > len(self.entities):
+			return np.arange(len(self.entities)) # cheaper to check every entity
+
+		cells = np.stack(np.meshgrid(*[np.arange(l, h + 1) for l, h in zip(low_cell, high_cell)], indexing = 'ij'), -1).reshape(-1, self.dimensions)
+		keys = self.__keys(cells)
+		return self.order[self.__ranges(np.searchsorted(self.sorted_keys, keys, 'left'), np.searchsorted(self.sorted_keys, keys, 'right'))]
+
+	@staticmethod
+	def __ranges(starts, ends):
+		'''Concatenates `arange(start, end)` for each pair of starts and ends.'''
+		counts = ends - starts
+		return np.repeat(starts - np.cumsum(counts) + counts, counts) + np.arange(counts.sum())
+
+	@staticmethod
+	def __expand(i, starts, ends):
+		counts = np.maximum(ends - starts, 0)
+		return np.stack((np.repeat(i, counts), SpatialHash.__ranges(starts, starts + counts)))
@@ -0,0 +1,104 @@
+from itertools import repeat
+
+from . import Entity, manager, np, pygame
+
+
+class SpriteBatch(Entity):
+	'''
+	Collects sprites during the render phase and draws them onto the canvas together at the end of it, in one `blits` call per layer.\n
+	Positions are in world space, offset by `manager.screen_pos`, and sprites entirely outside the canvas are dropped as they are added.
+	Lower layers are drawn first, sprites of the same layer in the order they were added.
+	The batch is drawn at render priority infinity, subclass it and decorate `render` again to draw it at another priority.
+
+	```
+	batch = SpriteBatch()
+
+	class Item(Entity):
+		def render(self):
+			batch.add(self.sprite, self.pos, layer = 1)
+	```
+	'''
+
+	def __init__(self, target:pygame.Surface = None) -> None:
+		self.target = target
+		'''Surface drawn onto, `manager.canvas` if None.'''
+		self.layers:dict[int, list[tuple[pygame.Surface, tuple[float, float]]]] = {}
+		self.view = (0.0, 0.0, 0, 0)
+		'''Left, top, width and height of the area drawn, updated every frame after other `vary_update` functions.'''
+		self.drawn = 0
+		'''Number of sprites drawn by the last call to `flush`.'''
+		self.culled = 0
+		'''Number of sprites dropped for being outside the view before the last call to `flush`.'''
+		self.culling = 0
+		self.__update_view()
+
+	@Entity.priority(float('inf'))
+	def vary_update(self):
+		self.__update_view()
+
+	@Entity.priority(float('inf'))
+	def render(self):
+		self.flush()
+
+	def __update_view(self):
+		target = self.target if self.target is not None else manager.canvas
+		x, y = manager.screen_pos
+		self.view = (float(x), float(y), *target.get_size())
+
+	def add(self, surface:pygame.Surface, position, layer = 0):
+		'''Queues the surface to be drawn with its top left corner at the world position.'''
+		left, top, width, height = self.view
+		x = position[0] - left
+		y = position[1] - top
+		w, h = surface.get_size()
+		if x >= width or y >= height or x + w <= 0 or y + h <= 0:
+			self.culling += 1
+			return
+
+		sprites = self.layers.get(layer)
+		if sprites is None:
+			sprites = self.layers[layer] = []
+		sprites.append((surface, (x, y)))
+
+	def add_many(self, surfaces:pygame.Surface | list[pygame.Surface], positions:np.ndarray, layer = 0):
+		'''
+		Queues many sprites at once, culling them together.  Suited to `Entity.batched` render functions of a `ColumnEntity`.\n
+		`surfaces` is one surface drawn at every position or a surface for each position, and `positions` an (n, 2) array of world positions.
+		'''
+		left, top, width, height = self.view
+		positions = np.asarray(positions, float) - (left, top)
+		if isinstance(surfaces, pygame.Surface):
+			sizes = np.array(surfaces.get_size(), float)
+		else:
+			sizes = np.array([s.get_size() for s in surfaces], float)
+
+		visible = np.all((positions < (width, height)) & (positions + sizes > 0), axis = 1)
+		self.culling += len(positions) - int(np.count_nonzero(visible))
+
+		sprites = self.layers.get(layer)
+		if sprites is None:
+			sprites = self.layers[layer] = []
+
+		points = zip(*positions[visible].astype(int).T.tolist()) # blits truncates to whole pixels anyway
+		if isinstance(surfaces, pygame.Surface):
+			sprites.extend(zip(repeat(surfaces), points))
+		else:
+			sprites.extend(zip([s for s, v in zip(surfaces, visible.tolist()) if v], points))
+
+	def flush(self):
+		'''Draws every queued sprite by layer and empties the batch.'''
+		target = self.target if self.target is not None else manager.canvas
+		fblits = getattr(target, 'fblits', None) # pygame-ce only, skips building the list of rects blits returns
+
+		self.drawn = 0
+		for layer in sorted(self.layers):
+			sprites = self.layers[layer]
+			if fblits is not None:
+				fblits(sprites)
+			else:
+				target.blits(sprites, False)
+			self.drawn += len(sprites)
+
+		self.layers.clear()
+		self.culled = self.culling
+		self.culling = 0
@@ -0,0 +1,77 @@
+from collections import OrderedDict
+
+from . import pygame
+
+
+class SurfaceCache:
+	'''
+	Least recently used cache of scaled, rotated and flipped copies of surfaces, converted to the display's pixel format.\n
+	Angles are rounded to multiples of `angle_step` degrees so that slowly turning sprites reuse the same few copies.
+	The least recently used copies are dropped once the cached pixels take more than `max_bytes`.
+	Surfaces are cached by identity, so sprites should be created once, like subsurfaces of a sprite sheet, not every frame.
+
+	`manager.canvas.blit(manager.surface_cache.get(sprite, scale = 2, angle = self.angle), self.pos)`
+	'''
+
+	def __init__(self, max_bytes = 64 * 1024 * 1024, angle_step = 1.0) -> None:
+		self.max_bytes = max_bytes
+		self.angle_step = angle_step
+		self.surfaces:OrderedDict[tuple, pygame.Surface] = OrderedDict()
+		self.bytes = 0
+		'''Bytes of pixels currently cached.'''
+		self.hits = 0
+		self.misses = 0
+
+	def get(self, surface:pygame.Surface, scale:float | tuple[float, float] = 1, angle = 0.0, flip_x = False, flip_y = False, smooth = False) -> pygame.Surface:
+		'''
+		Returns the surface flipped, scaled by the factor or separate x and y factors, then rotated counterclockwise by the angle in degrees.\n
+		`smooth` filters with `smoothscale` and `rotozoom` instead of taking the nearest pixels.
+		'''
+		angle = round(angle / self.angle_step) * self.angle_step % 360
+		key = (surface, scale, angle, flip_x, flip_y, smooth)
+		cached = self.surfaces.get(key)
+		if cached is not None:
+			self.surfaces.move_to_end(key)
+			self.hits += 1
+			return cached
+
+		self.misses += 1
+		cached = self.__convert(self.__transform(surface, scale, angle, flip_x, flip_y, smooth))
+		self.surfaces[key] = cached
+		self.bytes += SurfaceCache.__size(cached)
+		while self.bytes > self.max_bytes and len(self.surfaces) > 1:
+			_, dropped = self.surfaces.popitem(last = False)
+			self.bytes -= SurfaceCache.__size(dropped)
+		return cached
+
+	def clear(self):
+		'''Drops every cached surface, needed if the display's pixel format changes.'''
+		self.surfaces.clear()
+		self.bytes = 0
+
+	@staticmethod
+	def __transform(surface:pygame.Surface, scale, angle:float, flip_x:bool, flip_y:bool, smooth:bool):
+		if flip_x or flip_y:
+			surface = pygame.transform.flip(surface, flip_x, flip_y)
+
+		sx, sy = scale if isinstance(scale, tuple) else (scale, scale)
+		if sx != 1 or sy != 1:
+			size = (max(1, round(surface.get_width() * sx)), max(1, round(surface.get_height() * sy)))
+			surface = pygame.transform.smoothscale(surface, size) if smooth else pygame.transform.scale(surface, size)
+
+		if angle:
+			surface = pygame.transform.rotozoom(surface, angle, 1) if smooth else pygame.transform.rotate(surface, angle)
+		return surface
+
+	@staticmethod
+	def __convert(surface:pygame.Surface):
+		'''Converts to the display's pixel format so blits take the fast path, keeping per pixel alpha if the surface has it.'''
+		if pygame.display.get_surface() is None:
+			return surface
+		if surface.get_flags() & pygame.SRCALPHA:
+			return surface.convert_alpha()
+		return surface.convert()
+
+	@staticmethod
+	def __size(surface:pygame.Surface):
+		return surface.get_pitch() * surface.get_height()
@@ -27,14 +27,14 @@ class CameraController(Entity):
 		if np.any(mov != 0):
 			self.has_moved()
 	
-	@Entity.watch_event(pygame.MOUSEMOTION)
-	def mouse_movement(self, event):
+	@Entity.watch_coalesced_event(pygame.MOUSEMOTION, total = 'rel')
+	def mouse_movement(self, rel):
 		if self.mouse_is_locked:
-			self.x_rot += event.rel[0] * -0.5
-			self.y_rot += event.rel[1] * -0.5
+			self.x_rot += rel[0] * -0.5
+			self.y_rot += rel[1] * -0.5
 			self.y_rot = clamp(self.y_rot, -90, 90)
 			
-	@Entity.watch_event(pygame.KEYDOWN)
+	@Entity.watch_event(pygame.KEYDOWN, key = (pygame.K_ESCAPE, pygame.K_SPACE, pygame.K_t))
 	def keydown(self, event):
 		if event.key == pygame.K_ESCAPE:
 			manager.quit()
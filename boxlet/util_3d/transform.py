@@ -3,6 +3,12 @@ from .. import np
 
 
 class Transform:
+	__slots__ = ()
+	# Empty so that it can be mixed with other slotted classes like Entity.
+	# Subclasses without __slots__ get a __dict__, slotted subclasses need to include transform_slots.
+
+	transform_slots = ('model_matrix', 'model_matrix_changed')
+
 	def __init__(self, *args, **kwargs) -> None:
 		super().__init__(*args, **kwargs)
 		self.model_matrix = np.identity(4, np.float32)
@@ -80,3 +86,10 @@ if __name__ == '__main__':
 	class TestMovableEntity(Entity, Transform):
 		def __init__(self) -> None:
 			super().__init__()
+
+	class TestSlottedEntity(Entity, Transform):
+		__slots__ = Transform.transform_slots + ('speed',)
+
+		def __init__(self) -> None:
+			super().__init__()
+			self.speed = 1
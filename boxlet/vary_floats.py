@@ -1,7 +1,110 @@
 import numpy as np
 
+
+class InterpolationArena:
+	'''
+	Contiguous buffers holding the previous, current and interpolated values of every registered `VaryFloats` of a type,
+	so they are all interpolated together by a few NumPy calls writing into preallocated memory.\n
+	Members keep views of their part of the buffers.  When the buffers grow their members are moved and given new views,
+	so views taken from a registered `VaryFloats` before it or another member grows no longer alias the arena.
+	Removed members leave holes that are dropped the next time the buffers grow.
+	'''
+
+	arenas:list['InterpolationArena'] = []
+
+	def __init__(self, row_shape:tuple[int, ...] = (), capacity = 1024) -> None:
+		self.row_shape = row_shape
+		'''Shape of the values interpolated together, like (4,) for quaternions.  Members' values are split into rows of this shape.'''
+		self.members:dict['VaryFloats', tuple[int, int]] = {}
+		'''Start and number of rows of each member.'''
+		self.used = 0
+		self.__allocate(capacity)
+		InterpolationArena.arenas.append(self)
+
+	def __allocate(self, capacity:int):
+		self.current = np.zeros((capacity, *self.row_shape))
+		self.previous = np.zeros((capacity, *self.row_shape))
+		self.out = np.zeros((capacity, *self.row_shape))
+
+	def add(self, member:'VaryFloats'):
+		'''Copies the values of the member into the arena and gives it views of them.'''
+		current, previous = member._backing_arrays()
+		n = current.size // max(1, int(np.prod(self.row_shape)))
+		if self.used + n > len(self.current):
+			self.__grow(n)
+
+		start = self.used
+		self.current[start:start + n] = current.reshape(-1, *self.row_shape)
+		self.previous[start:start + n] = previous.reshape(-1, *self.row_shape)
+		self.out[start:start + n] = self.current[start:start + n]
+		self.members[member] = (start, n)
+		self.used += n
+		self.__bind(member, current.shape)
+
+	def remove(self, member:'VaryFloats'):
+		'''Gives the member copies of its values and forgets it.'''
+		current, _ = member._backing_arrays()
+		start, n = self.members.pop(member)
+		member._bind_arrays(self.current[start:start + n].reshape(current.shape).copy(), self.previous[start:start + n].reshape(current.shape).copy(), None)
+		if not self.members:
+			self.used = 0
+
+	def moved(self, member:'VaryFloats'):
+		'''Called after a member replaced its arrays, like when growing, to copy them into the arena again.'''
+		del self.members[member]
+		self.add(member)
+
+	def __grow(self, extra:int):
+		live = sum(n for _, n in self.members.values())
+		old_current, old_previous, old_out = self.current, self.previous, self.out
+		self.__allocate(max(1024, (live + extra) * 2))
+
+		self.used = 0
+		for member, (start, n) in self.members.items():
+			self.current[self.used:self.used + n] = old_current[start:start + n]
+			self.previous[self.used:self.used + n] = old_previous[start:start + n]
+			self.out[self.used:self.used + n] = old_out[start:start + n]
+			self.members[member] = (self.used, n)
+			self.used += n
+		for member in self.members:
+			self.__bind(member, member._backing_arrays()[0].shape)
+
+	def __bind(self, member:'VaryFloats', shape:tuple[int, ...]):
+		start, n = self.members[member]
+		member._bind_arrays(self.current[start:start + n].reshape(shape), self.previous[start:start + n].reshape(shape), self.out[start:start + n].reshape(shape))
+
+	def interpolate(self, t:float):
+		'''Writes the interpolation of every member into its `interpolated` view.'''
+		used = self.used
+		out = self.out[:used]
+		previous = self.previous[:used]
+		np.subtract(self.current[:used], previous, out = out)
+		np.multiply(out, t, out = out)
+		np.add(out, previous, out = out)
+
+	@staticmethod
+	def interpolate_all(t:float):
+		'''Interpolates every arena with members, called by the manager each frame once `interpolate_time` is known.'''
+		for arena in InterpolationArena.arenas:
+			if arena.used:
+				arena.interpolate(t)
+
+
 class VaryFloats:
-	def __init__(self, values=None, size=None) -> None:
+	'''
+	Previous and current values of something set every fixed update, for interpolating between them.\n
+	With `capacity`, rows live in buffers that grow by doubling, so `extend` is amortized O(1) per row and `swap_remove` is O(1).
+	Each row then gets a handle that stays the same while other rows move, see `index_of`.
+	`current`, `previous` and the handle views are slices of the buffers, they stay valid until the buffers grow.
+
+	After `register()` the values live in the type's `arena`, and `interpolated` is refreshed in place every frame
+	with `manager.interpolate_time`, before `vary_update` functions are called.
+	Registered values are read while a simulation thread may be writing them, so use `SharedVaryFloats` with one instead.
+	'''
+
+	arena = InterpolationArena()
+
+	def __init__(self, values=None, size=None, capacity:int = None) -> None:
 		if values is not None:
 			self.current = np.array(values, float)
 			self.previous = np.array(values, float)
@@ -11,6 +114,107 @@ class VaryFloats:
 		else:
 			raise Exception('Invalid Input')
 
+		self.count:int | None = None
+		'''Number of live rows with a capacity, None without one.'''
+		self.interpolated:np.ndarray | None = None
+		'''Values interpolated every frame while registered, None otherwise.'''
+		self.registered = False
+		self._interpolated_buffer:np.ndarray | None = None
+		if capacity is not None:
+			self.__init_capacity(capacity)
+
+	def __init_capacity(self, capacity:int):
+		count = len(self.current)
+		capacity = max(capacity, count, 1)
+		self._current_buffer = np.zeros((capacity, *self.current.shape[1:]))
+		self._previous_buffer = np.zeros((capacity, *self.current.shape[1:]))
+		self._current_buffer[:count] = self.current
+		self._previous_buffer[:count] = self.previous
+
+		self._row_handles = np.zeros(capacity, np.int64)
+		self._row_handles[:count] = np.arange(count)
+		self._handle_rows = np.full(capacity, -1, np.int64)
+		self._handle_rows[:count] = np.arange(count)
+		self._free_handles = np.zeros(capacity, np.int64) # stack of unused handles, the lowest is taken first
+		self._free_count = capacity - count
+		self._free_handles[:self._free_count] = np.arange(capacity - 1, count - 1, -1)
+
+		self.count = count
+		self.__update_views()
+
+	def __update_views(self):
+		self.current = self._current_buffer[:self.count]
+		self.previous = self._previous_buffer[:self.count]
+		if self._interpolated_buffer is not None:
+			self.interpolated = self._interpolated_buffer[:self.count]
+
+	def register(self):
+		'''Moves the values into the type's `arena`, so `interpolated` is refreshed every frame along with every other registered instance.'''
+		if not self.registered:
+			self.registered = True
+			type(self).arena.add(self)
+
+	def unregister(self):
+		'''Moves the values out of the arena, `interpolated` is no longer refreshed.'''
+		if self.registered:
+			self.registered = False
+			type(self).arena.remove(self)
+
+	def _backing_arrays(self) -> tuple[np.ndarray, np.ndarray]:
+		'''Current and previous arrays holding every value, including unused rows with a capacity.'''
+		if self.count is None:
+			return self.current, self.previous
+		return self._current_buffer, self._previous_buffer
+
+	def _bind_arrays(self, current:np.ndarray, previous:np.ndarray, interpolated:np.ndarray | None):
+		'''Replaces the arrays returned by `_backing_arrays`, used by the arena.'''
+		if self.count is None:
+			self.current, self.previous, self.interpolated = current, previous, interpolated
+		else:
+			self._current_buffer, self._previous_buffer, self._interpolated_buffer = current, previous, interpolated
+			self.interpolated = None
+			self.__update_views()
+
+	@property
+	def capacity(self) -> int | None:
+		return None if self.count is None else len(self._current_buffer)
+
+	@property
+	def handles(self) -> np.ndarray:
+		'''Handle of each live row.'''
+		return self._row_handles[:self.count]
+
+	def index_of(self, handle:int) -> int:
+		'''Returns the current row of the handle, raising KeyError if it was never given out or its row was removed.'''
+		row = int(self._handle_rows[handle]) if 0 <= handle < len(self._handle_rows) else -1
+		if row < 0:
+			raise KeyError(f'Stale or unknown handle {handle}.')
+		return row
+
+	def reserve(self, capacity:int):
+		'''Grows the buffers to hold at least the given number of rows, at least doubling them.  Views taken before growing no longer alias the buffers.'''
+		old = len(self._current_buffer)
+		if capacity <= old:
+			return
+
+		capacity = max(capacity, old * 2)
+		for name in ('_current_buffer', '_previous_buffer'):
+			a = getattr(self, name)
+			new_a = np.zeros((capacity, *a.shape[1:]))
+			new_a[:self.count] = a[:self.count]
+			setattr(self, name, new_a)
+
+		self._row_handles = np.concatenate((self._row_handles, np.zeros(capacity - old, np.int64)))
+		self._handle_rows = np.concatenate((self._handle_rows, np.full(capacity - old, -1, np.int64)))
+		free_handles = np.zeros(capacity, np.int64)
+		free_handles[:capacity - old] = np.arange(capacity - 1, old - 1, -1)
+		free_handles[capacity - old:capacity - old + self._free_count] = self._free_handles[:self._free_count]
+		self._free_handles = free_handles
+		self._free_count += capacity - old
+		self.__update_views()
+		if self.registered:
+			type(self).arena.moved(self)
+
 	def set_full(self, values):
 		self.current[:] = values
 		self.previous[:] = values
@@ -38,13 +242,131 @@ class VaryFloats:
 		self.previous[ran] = self.current[ran]
 		self.current[ran] = values
 
-	def extend(self, values):
-		self.previous = np.append(self.previous, values, axis = 0)
-		self.current = np.append(self.current, values, axis = 0)
+	def extend(self, values) -> np.ndarray | None:
+		'''Appends rows, as both their previous and current values.  With a capacity, returns the handles of the new rows.'''
+		if self.count is None:
+			self.previous = np.append(self.previous, values, axis = 0)
+			self.current = np.append(self.current, values, axis = 0)
+			if self.registered:
+				type(self).arena.moved(self)
+			return None
+
+		values = np.asarray(values, float).reshape(-1, *self._current_buffer.shape[1:])
+		n = len(values)
+		self.reserve(self.count + n)
+
+		start = self.count
+		self._current_buffer[start:start + n] = values
+		self._previous_buffer[start:start + n] = values
+
+		self._free_count -= n
+		handles = self._free_handles[self._free_count:self._free_count + n][::-1].copy()
+		self._row_handles[start:start + n] = handles
+		self._handle_rows[handles] = np.arange(start, start + n)
+
+		self.count += n
+		self.__update_views()
+		return handles
 
 	def delete(self, ran):
-		self.previous = np.delete(self.previous, ran, axis = 0)
-		self.current = np.delete(self.current, ran, axis = 0)
+		'''Removes rows, keeping the rest in order.  With a capacity this compacts the buffers in place, `swap_remove` is faster for single rows.'''
+		if self.count is None:
+			self.previous = np.delete(self.previous, ran, axis = 0)
+			self.current = np.delete(self.current, ran, axis = 0)
+			if self.registered:
+				type(self).arena.moved(self)
+			return
+
+		rows = np.arange(self.count)
+		kept = np.delete(rows, ran)
+		removed = np.setdiff1d(rows, kept, assume_unique = True)
+		self.__free(self._row_handles[removed])
+
+		n = len(kept)
+		self._current_buffer[:n] = self._current_buffer[kept]
+		self._previous_buffer[:n] = self._previous_buffer[kept]
+		self._row_handles[:n] = self._row_handles[kept]
+		self._handle_rows[self._row_handles[:n]] = np.arange(n)
+
+		self.count = n
+		self.__update_views()
+
+	def swap_remove(self, index:int) -> int | None:
+		'''
+		Removes the row by moving the last row into its place.  Returns the index the moved row came from, or None if no row moved.\n
+		Negative indices count from the end like lists.
+		'''
+		last = self.count - 1
+		if index < 0:
+			index += self.count
+		if not 0 <= index <= last:
+			raise IndexError('VaryFloats row index out of range')
+		self.__free(self._row_handles[index:index + 1])
+
+		moved = None
+		if index != last:
+			self._current_buffer[index] = self._current_buffer[last]
+			self._previous_buffer[index] = self._previous_buffer[last]
+			handle = self._row_handles[last]
+			self._row_handles[index] = handle
+			self._handle_rows[handle] = index
+			moved = last
+
+		self.count = last
+		self.__update_views()
+		return moved
+
+	def remove(self, handle:int) -> int | None:
+		'''Removes the row of the handle with `swap_remove`, returning the index the moved row came from.'''
+		return self.swap_remove(self.index_of(handle))
+
+	def __free(self, handles:np.ndarray):
+		self._handle_rows[handles] = -1
+		self._free_handles[self._free_count:self._free_count + len(handles)] = handles
+		self._free_count += len(handles)
+
+	def interpolate(self, t, out:np.ndarray = None) -> np.ndarray:
+		'''Returns the values between previous and current at `t`, written into `out` without allocating if given.'''
+		if out is None:
+			return self.previous + (self.current - self.previous) * t
+		np.subtract(self.current, self.previous, out = out)
+		np.multiply(out, t, out = out)
+		np.add(out, self.previous, out = out)
+		return out
+
+
+class SharedVaryFloats:
+	'''
+	Previous and current values for interpolation, handed from one thread to another.\n
+	Setting values never writes into arrays that may be read, the new pair is built first and swapped in with one assignment,
+	so a reader on another thread always interpolates a matching previous and current value without any locking.
+	Only one thread should set values.
+	'''
+
+	def __init__(self, values=None, size=None) -> None:
+		if values is not None:
+			current = np.array(values, float)
+		elif size is not None:
+			current = np.zeros(size)
+		else:
+			raise Exception('Invalid Input')
+		self.buffers = (current, current)
+
+	@property
+	def previous(self) -> np.ndarray:
+		return self.buffers[0]
+
+	@property
+	def current(self) -> np.ndarray:
+		return self.buffers[1]
+
+	def set_full(self, values):
+		current = np.array(values, float)
+		self.buffers = (current, current)
+
+	def set(self, values):
+		self.buffers = (self.buffers[1], np.array(values, float))
 
 	def interpolate(self, t):
-		return self.previous + (self.current - self.previous) * t
+		previous, current = self.buffers
+		return previous + (current - previous) * t
@@ -15,6 +15,9 @@ sub_locs.extend([(89, 0, 14, 14), (89, 15, 14, 14)]) # apple and fish sprites
 
 sub_sprites = list(map(sprite_sheet.subsurface, sub_locs))
 
+# draws every sprite in one call at the end of the render phase, players above items
+batch = SpriteBatch()
+
 
 class Player(Entity):
 
@@ -61,17 +64,15 @@ class Player(Entity):
 			self.facing_dir = self.dir_map[dir[1]][dir[0]]
 			self.animation_time += manager.fixed_delta_time * 8
 
-	@Entity.watch_event(pygame.KEYDOWN)
+	@Entity.watch_event(pygame.KEYDOWN, key = pygame.K_ESCAPE)
 	def keydown(self, event):
-		if event.key == pygame.K_ESCAPE:
-			manager.quit()
+		manager.quit()
 
-	@Entity.priority(10)
 	def render(self):
 		frame = 1 if self.animation_time == 0 else floor(self.animation_time) % 4
 		bump = [0, (frame+1) % 2]
 		sprite_id = self.sprite_animation[self.facing_dir][frame]
-		manager.canvas.blit(sub_sprites[sprite_id], self.pos - bump)
+		batch.add(sub_sprites[sprite_id], self.pos - bump, layer = 1)
 
 
 class Item(Entity):
@@ -79,9 +80,8 @@ class Item(Entity):
 		self.sprite_id = sprite_id
 		self.pos = np.array(pos)
 
-	@Entity.priority(0)
 	def render(self):
-		manager.canvas.blit(sub_sprites[self.sprite_id], self.pos)
+		batch.add(sub_sprites[self.sprite_id], self.pos)
 
 
 class Apple(Item):
@@ -17,5 +17,5 @@ setup(
         'pyopengl-accelerate',
         ],
     },
-    python_requires='>=3.6',
+    python_requires='>=3.10',
 )